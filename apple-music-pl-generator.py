@@ -1,22 +1,24 @@
 #!/usr/bin/env python3
+import asyncio
+import functools
+import importlib
 import os
-import questionary
-import editor
+import sys
+import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from scheduler import generate_round_robin
 from pid_utils import get_label_with_optional_pid
 from io_xml_txt import (
-    parse_xml_playlist,
+    index_xml_playlist,
+    count_xml_playlist,
     write_playlist_file,
-    read_txt_playlist_file,
+    iter_txt_playlist_file,
     sanitize_filename,
-    fix_playlist_urls,
-)
-from apple_music_bridge import (
-    maybe_apply_to_apple_music,
-    update_playlist_description,
-    get_playlist_description,
+    fix_playlist_urls_bytes,
+    save_fixed_playlist,
+    clear_xml_cache,
 )
 from colors import (
     FG_GREEN,
@@ -31,6 +33,57 @@ from colors import (
 )
 
 
+# questionary (prompt_toolkit), editor and apple_music_bridge are imported inside
+# the functions that use them, so startup doesn't pay for them up front.
+
+
+# ---------- Helper: cached listing of the current directory ----------
+
+_DIR_CACHE_TTL = 5.0  # seconds
+_dir_cache = {"at": None, "names": frozenset()}
+
+
+def _cached_dir_names(refresh=False):
+    """
+    Names of the regular files in the current directory, from a single
+    os.scandir pass that is reused for a few seconds. Lets the menu and
+    the XML lookup share one directory listing instead of stat-ing each path.
+    """
+    now = time.monotonic()
+    if refresh or _dir_cache["at"] is None or now - _dir_cache["at"] > _DIR_CACHE_TTL:
+        with os.scandir(".") as it:
+            _dir_cache["names"] = frozenset(e.name for e in it if e.is_file())
+        _dir_cache["at"] = now
+    return _dir_cache["names"]
+
+
+def _is_file(path):
+    """
+    os.path.isfile, answered from the cached listing for bare file names.
+    A miss still asks the filesystem: the listing is case-sensitive (macOS
+    volumes usually aren't) and may be a few seconds old.
+    """
+    if not os.path.dirname(path) and path in _cached_dir_names():
+        return True
+    return os.path.isfile(path)
+
+
+# ---------- Helper: cached absolute paths ----------
+
+# Working directory for the current menu action (refreshed by main())
+_cwd = os.getcwd()
+
+
+@functools.lru_cache(maxsize=128)
+def _abspath_in(cwd, path):
+    return os.path.normpath(os.path.join(cwd, path))
+
+
+def _abspath(path):
+    """os.path.abspath without calling os.getcwd() each time."""
+    return _abspath_in(_cwd, path)
+
+
 # ---------- Helper: choose base playlist (TXT list + new) ----------
 
 def choose_base_playlist_name():
@@ -39,8 +92,13 @@ def choose_base_playlist_name():
     Also allow entering a completely new playlist name.
     Returns the base name WITHOUT .txt extension.
     """
+    import questionary
+
+    # One pass: (file name, base name without .txt) for every TXT playlist
     txt_files = sorted(
-        [f for f in os.listdir(".") if f.lower().endswith(".txt")]
+        (f, f[:-4])
+        for f in _cached_dir_names(refresh=True)
+        if f[-4:].lower() == ".txt"
     )
 
     if not txt_files:
@@ -51,8 +109,8 @@ def choose_base_playlist_name():
         return (base or "").strip()
 
     choices = [
-        questionary.Choice(title=f, value=f[:-4])  # strip .txt
-        for f in txt_files
+        questionary.Choice(title=f, value=base_name)
+        for f, base_name in txt_files
     ]
     choices.append(
         questionary.Choice(
@@ -87,6 +145,8 @@ def choose_scheduler_mode():
     Ask the user whether they want strict or randomized ordering.
     Returns "strict" or "random".
     """
+    import questionary
+
     choice = questionary.select(
         "Choose scheduling mode:",
         choices=[
@@ -107,19 +167,56 @@ def choose_scheduler_mode():
 
 # ---------- Helper: description handling ----------
 
-def handle_playlist_description_update(playlist_name: str) -> None:
+# Playlist descriptions read from / written to Apple Music during this run,
+# so touching the same playlist again doesn't need another osascript call.
+_DESC_CACHE: dict[str, str] = {}
+
+
+def _get_desc(playlist_name: str) -> str:
+    """get_playlist_description, memoized per playlist for this session (errors are not cached)."""
+    from apple_music_bridge import get_playlist_description
+
+    if playlist_name in _DESC_CACHE:
+        return _DESC_CACHE[playlist_name]
+    desc = get_playlist_description(playlist_name).strip()
+    if not desc.startswith("ERROR:"):
+        _DESC_CACHE[playlist_name] = desc
+    return desc
+
+
+def choose_playlist_description(playlist_name: str, current_future=None, will_create: bool = False):
     """
-    1) Fetch current description from Apple Music.
+    1) Fetch current description from Apple Music
+       (or take it from current_future if it was already fetched in the background).
     2) Use editor.PLAYLIST_DESCRIPTION if set, otherwise:
          - If current desc is empty, offer a default template.
          - If current desc exists and no custom desc, do nothing unless user explicitly wants change.
-    3) Show current vs new, and confirm before applying update.
+    3) Show current vs new, and confirm.
+    Returns the new description to apply, or None to leave it alone.
+    will_create: the playlist is about to be (re)built, so a playlist that
+    can't be read yet is treated as having no description.
     """
+    import questionary
+    import editor
+
+    current = None
+    if current_future is not None:
+        try:
+            current = current_future.result()
+        except Exception:
+            current = None
+        # The playlist may only have been created by the apply step; read it again then
+        if current is not None and current.startswith("ERROR:"):
+            current = "" if will_create else None
+
     # Try to read current description from Apple Music
-    current = get_playlist_description(playlist_name).strip()
+    if current is None:
+        current = _get_desc(playlist_name)
     if current.startswith("ERROR:"):
-        print(f"⚠️ Could not read current playlist description: {current}")
-        return
+        if not will_create:
+            print(f"⚠️ Could not read current playlist description: {current}")
+            return None
+        current = ""
 
     # Custom description from the editor (D option)
     pending = getattr(editor, "PLAYLIST_DESCRIPTION", "").strip()
@@ -137,7 +234,7 @@ def handle_playlist_description_update(playlist_name: str) -> None:
                 default=False,
             ).ask()
             if not change:
-                return
+                return None
 
             # If they *do* want to change it, prompt for a new one (no default template forced)
             new_desc = questionary.text(
@@ -145,7 +242,7 @@ def handle_playlist_description_update(playlist_name: str) -> None:
             ).ask() or ""
             if not new_desc.strip():
                 print("No new description entered. Keeping existing description.")
-                return
+                return None
         else:
             # No description in Apple Music + no pending custom → propose default template
             default_desc = f"{playlist_name} – {datetime.now(timezone.utc).strftime('%b %d')}"
@@ -155,7 +252,7 @@ def handle_playlist_description_update(playlist_name: str) -> None:
                 default=True,
             ).ask()
             if not use_default:
-                return
+                return None
             new_desc = default_desc
 
     # At this point we have a new_desc to apply.
@@ -175,28 +272,87 @@ def handle_playlist_description_update(playlist_name: str) -> None:
     ).ask()
     if not confirm:
         print("Description update cancelled.")
-        return
+        return None
+    return new_desc
 
-    result = update_playlist_description(playlist_name, new_desc)
+
+def _record_desc_result(playlist_name: str, new_desc: str, result: str) -> None:
+    if result == "OK":
+        _DESC_CACHE[playlist_name] = new_desc
+    else:
+        _DESC_CACHE.pop(playlist_name, None)
     print(f"Playlist description update result: {result}")
 
 
+def handle_playlist_description_update(playlist_name: str, current_future=None) -> None:
+    """
+    Ask for a new playlist description (see choose_playlist_description) and apply it.
+    """
+    from apple_music_bridge import update_playlist_description
+
+    new_desc = choose_playlist_description(playlist_name, current_future=current_future)
+    if new_desc is None:
+        return
+    result = update_playlist_description(playlist_name, new_desc)
+    _record_desc_result(playlist_name, new_desc, result)
+
+
 # ---------- Helper: apply TXT -> Apple Music (+ description) ----------
 
+# Background worker for AppleScript round-trips that can overlap local work
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+
+def clean_playlist_urls(txt_path: str) -> None:
+    """
+    Clean URL labels from the TXT (interactive if any are found).
+    The file is read once and only rewritten if something was fixed; the
+    usual no-URL case is a single byte scan inside fix_playlist_urls_bytes.
+    """
+    try:
+        with open(txt_path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        print(f"❌ TXT file not found when trying to clean URLs: {txt_path}")
+        return
+
+    new_data = fix_playlist_urls_bytes(data, source=txt_path)
+    if new_data is not data:
+        save_fixed_playlist(txt_path, new_data)
+
+
 def apply_to_apple_music_with_description(playlist_name: str, txt_path: str) -> None:
     """
     1) Clean any URL-style labels from TXT (interactive if needed).
-    2) Call maybe_apply_to_apple_music to push the tracks.
-    3) Then handle playlist description update (current vs new + optional default).
+    2) Ask whether to push the tracks, and which description to set.
+    3) Push the tracks and update the description in the same AppleScript call.
     """
+    from apple_music_bridge import (
+        ask_apply_options,
+        apply_playlist_to_apple_music_from_txt,
+        apply_playlist_with_description,
+    )
+
+    # Fetch the current description in the background while the TXT is cleaned
+    desc_future = _EXECUTOR.submit(_get_desc, playlist_name)
+
     # Ensure TXT is URL-free and in canonical label format
-    fix_playlist_urls(txt_path)
+    clean_playlist_urls(txt_path)
 
-    # This function usually prompts Y/N and does the clear+rebuild
-    maybe_apply_to_apple_music(playlist_name, txt_path)
+    # Ask everything up front so both Music.app updates can go out together
+    apply_now, clear_first = ask_apply_options(playlist_name)
+    if not apply_now:
+        handle_playlist_description_update(playlist_name, current_future=desc_future)
+        return
 
-    # Handle playlist description (show current, optionally apply new/default)
-    handle_playlist_description_update(playlist_name)
+    new_desc = choose_playlist_description(
+        playlist_name, current_future=desc_future, will_create=True
+    )
+    if new_desc is None:
+        apply_playlist_to_apple_music_from_txt(playlist_name, txt_path, clear_first=clear_first)
+        return
+    result = apply_playlist_with_description(playlist_name, txt_path, new_desc, clear_first)
+    _record_desc_result(playlist_name, new_desc, result)
 
 
 # ---------- Unified "work on playlist" flow (XML preferred) ----------
@@ -215,8 +371,8 @@ def resolve_xml_path(base):
 
     if ans == "" or ans.lower() in ("y", "yes"):
         # Try default <base>.xml or ask for it
-        default_xml = os.path.abspath(base + ".xml")
-        if os.path.isfile(default_xml):
+        if _is_file(base + ".xml"):
+            default_xml = _abspath(base + ".xml")
             use_default = input(
                 f"Found default XML '{default_xml}'. Use this? [Y/n]: "
             ).strip().lower()
@@ -227,9 +383,8 @@ def resolve_xml_path(base):
         path = input("Enter XML file path: ").strip()
         if not path:
             return None
-        xml_path = os.path.abspath(path)
-        if os.path.isfile(xml_path):
-            return xml_path
+        if _is_file(path):
+            return _abspath(path)
         else:
             print(color("❌ XML file not found. Continuing without XML.", FG_RED, BOLD))
             return None
@@ -238,46 +393,52 @@ def resolve_xml_path(base):
         return None
     else:
         # Treat ans as a possible path
-        xml_path = os.path.abspath(ans)
-        if os.path.isfile(xml_path):
-            return xml_path
+        if _is_file(ans):
+            return _abspath(ans)
         else:
             print(color("❌ XML file not found. Continuing without XML.", FG_RED, BOLD))
             return None
 
 
+def _validate_positive_int(value):
+    """questionary validator: True, or the error message to show."""
+    value = value.strip()
+    if not value.isdecimal() or int(value) <= 0:
+        return "Please enter a positive integer."
+    return True
+
+
 def new_playlist_flow(default_name=None):
+    import questionary
+
     print(color("\n--- New Playlist (from scratch) ---", FG_MAGENTA, BOLD))
-    while True:
-        try:
-            n = int(input("Number of unique songs: ").strip())
-            if n <= 0:
-                print("Please enter a positive integer.")
-                continue
-            break
-        except ValueError:
-            print("Please enter a valid integer.")
-
-    tracks = []
+    n = questionary.text(
+        "Number of unique songs:",
+        validate=_validate_positive_int,
+    ).ask()
+    if n is None:
+        return
+    n = int(n)
+
+    counter = Counter()
     for i in range(1, n + 1):
         print(f"\nSong {i}:")
+        # Blank or cancelled (Ctrl+C) prompts skip just this song
         raw_label = questionary.text(
             "  Enter song label (Title – Artist or [pid=...] Title – Artist):"
         ).ask()
         if not raw_label:
             print("  (blank, skipped)")
             continue
+        count = questionary.text(
+            "  How many times?",
+            validate=_validate_positive_int,
+        ).ask()
+        if count is None:
+            print("  (cancelled, skipped)")
+            continue
         label = get_label_with_optional_pid(raw_label)
-        while True:
-            try:
-                count = int(input("  How many times? ").strip())
-                if count <= 0:
-                    print("  Please enter a positive integer.")
-                    continue
-                break
-            except ValueError:
-                print("  Please enter a valid integer.")
-        tracks.append({"name": label, "count": count})
+        counter[label] += int(count)
 
     if default_name:
         use_default = questionary.confirm(
@@ -301,7 +462,7 @@ def new_playlist_flow(default_name=None):
     print("\nGenerating round-robin order...")
     try:
         ordered = generate_round_robin(
-            tracks,
+            counter,
             preferred_gap=3,
             min_allowed_gap=2,
             randomize=use_random,
@@ -330,13 +491,16 @@ def work_on_playlist_flow():
       - Else use <name>.txt if present
       - Else notify user and switch to creation mode
     """
+    import questionary
+    import editor
+
     print(color("\n--- Work on a Playlist (XML if provided, else TXT, else create new) ---", FG_MAGENTA, BOLD))
     base = choose_base_playlist_name()
     if not base:
         print(color("❌ No name given.", FG_RED, BOLD))
         return
 
-    txt_path = os.path.abspath(base + ".txt")
+    txt_path = _abspath(base + ".txt")
 
     # Ask about XML
     xml_path = resolve_xml_path(base)
@@ -344,8 +508,9 @@ def work_on_playlist_flow():
     if xml_path:
         # Use XML as base
         print(f"\nUsing XML export: {xml_path}")
+        # Only counts are needed here, so the ordered song list is never built
         try:
-            xml_playlist_name, ordered_songs = parse_xml_playlist(xml_path)
+            xml_playlist_name, counter = count_xml_playlist(xml_path)
         except Exception as e:
             print(color(f"❌ Failed to parse XML: {e}", FG_RED, BOLD))
             return
@@ -363,17 +528,14 @@ def work_on_playlist_flow():
                 "Enter playlist name to use for TXT:"
             ).ask() or xml_playlist_name
 
-        counter = Counter(ordered_songs)
         editor.edit_playlist_counts(counter)
 
-        tracks = [{"name": name, "count": count} for name, count in counter.items()]
-
         mode = choose_scheduler_mode()
         use_random = (mode == "random")
 
         try:
             ordered = generate_round_robin(
-                tracks,
+                counter,
                 preferred_gap=3,
                 min_allowed_gap=2,
                 randomize=use_random,
@@ -396,25 +558,36 @@ def work_on_playlist_flow():
 
     else:
         # No XML → try TXT
-        if os.path.isfile(txt_path):
+        if _is_file(base + ".txt"):
             print(f"\nUsing TXT file: {txt_path}")
-            songs = read_txt_playlist_file(txt_path)
-            if not songs:
+            # Interning makes every repeat of a label share one string object
+            counter = Counter(map(sys.intern, iter_txt_playlist_file(txt_path)))
+            if not counter:
                 print(color("❌ No songs found in TXT file (non-comment lines).", FG_RED, BOLD))
                 return
 
             playlist_name = base
-            counter = Counter(songs)
+            # counter was built from this TXT, so an unchanged counter means the
+            # current order is still valid and regenerating it is optional
+            pre_counter = Counter(counter)
             editor.edit_playlist_counts(counter)
 
-            tracks = [{"name": name, "count": count} for name, count in counter.items()]
+            if counter == pre_counter:
+                regenerate = questionary.confirm(
+                    "No count changes. Regenerate the order anyway?",
+                    default=False,
+                ).ask()
+                if not regenerate:
+                    print(color("No edits; skipping regeneration.", FG_GRAY))
+                    apply_to_apple_music_with_description(playlist_name, txt_path)
+                    return
 
             mode = choose_scheduler_mode()
             use_random = (mode == "random")
 
             try:
                 ordered = generate_round_robin(
-                    tracks,
+                    counter,
                     preferred_gap=3,
                     min_allowed_gap=2,
                     randomize=use_random,
@@ -447,19 +620,22 @@ def sync_txt_from_xml_flow():
     This is useful if you manually changed the Apple Music playlist
     and want the TXT master to reflect that (names/order/counts).
     """
+    import questionary
+
     print(color("\n--- Sync TXT from XML (preserve Apple Music order) ---", FG_MAGENTA, BOLD))
     path = input("Enter XML file path: ").strip()
     if not path:
         print(color("❌ No path given.", FG_RED, BOLD))
         return
 
-    xml_path = os.path.abspath(path)
+    xml_path = _abspath(path)
     if not os.path.isfile(xml_path):
         print(color("❌ XML file not found.", FG_RED, BOLD))
         return
 
+    # Order matters here; keep it as indexes into the distinct labels
     try:
-        xml_playlist_name, ordered_songs = parse_xml_playlist(xml_path)
+        xml_playlist_name, unique_songs, order = index_xml_playlist(xml_path)
     except Exception as e:
         print(color(f"❌ Failed to parse XML: {e}", FG_RED, BOLD))
         return
@@ -477,11 +653,11 @@ def sync_txt_from_xml_flow():
             "Enter playlist name / base name for TXT:"
         ).ask() or xml_playlist_name
 
-    txt_path = os.path.abspath(sanitize_filename(playlist_name) + ".txt")
+    txt_path = _abspath(sanitize_filename(playlist_name) + ".txt")
     # Write TXT preserving original order (no round-robin here)
     txt_path = write_playlist_file(
         playlist_name,
-        ordered_songs,
+        map(unique_songs.__getitem__, order),
         output_path=txt_path,
         note="Synced from Apple Music XML (original order preserved)"
     )
@@ -491,11 +667,96 @@ def sync_txt_from_xml_flow():
     print(color("✅ TXT has been synced to match the Apple Music playlist.", FG_GREEN, BOLD))
 
 
+# ---------- Batch mode: every XML in the current folder ----------
+
+def _index_one_xml(xml_path):
+    """
+    Parse one XML export (original order preserved). Runs in a worker
+    thread, so it never prompts. Returns index_xml_playlist's result.
+    Batch runs read every export once, so skip the pickle cache and use the
+    two-pass read: only the chosen playlist's tracks are kept, which bounds
+    memory while several exports are parsed at the same time.
+    """
+    return index_xml_playlist(xml_path, use_cache=False, interactive=False)
+
+
+def batch_sync_flow():
+    """
+    Sync a TXT master from every XML export in the current directory.
+    XML parsing runs in a small thread pool; nothing is applied to Apple Music
+    here (use "Work on a playlist" per playlist for that, one at a time).
+    Exports whose playlists map to the same TXT file are reported and skipped,
+    so one never silently overwrites another.
+    """
+    import questionary
+
+    print(color("\n--- Batch sync TXTs from all XMLs in this folder ---", FG_MAGENTA, BOLD))
+    xml_files = sorted(
+        f for f in _cached_dir_names(refresh=True) if f[-4:].lower() == ".xml"
+    )
+    if not xml_files:
+        print(color("❌ No XML files found in the current directory.", FG_RED, BOLD))
+        return
+
+    print(f"Found {len(xml_files)} XML file(s).")
+    if not questionary.confirm(
+        "Overwrite the TXT master of each of these playlists with its XML order?",
+        default=False,
+    ).ask():
+        print(color("Batch sync cancelled.", FG_YELLOW))
+        return
+
+    parsed = {}
+    with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as ex:
+        futures = {ex.submit(_index_one_xml, _abspath(f)): f for f in xml_files}
+        for fut in as_completed(futures):
+            xml_name = futures[fut]
+            try:
+                parsed[xml_name] = fut.result()
+            except Exception as e:
+                print(color(f"❌ {xml_name}: {e}", FG_RED, BOLD))
+
+    # Group by target TXT before writing anything. Casefolded, since macOS
+    # volumes usually treat "Mix.txt" and "mix.txt" as the same file.
+    by_target = {}
+    for xml_name in sorted(parsed):
+        txt_path = _abspath(sanitize_filename(parsed[xml_name][0]) + ".txt")
+        by_target.setdefault(txt_path.casefold(), []).append((xml_name, txt_path))
+
+    done = 0
+    for entries in by_target.values():
+        if len(entries) > 1:
+            names = ", ".join(xml_name for xml_name, _ in entries)
+            print(color(
+                f"⚠️  Skipped {names}: their playlists would all be written to "
+                f"{entries[0][1]}. Sync them one at a time instead.",
+                FG_YELLOW, BOLD,
+            ))
+            continue
+
+        xml_name, txt_path = entries[0]
+        playlist_name, unique_songs, order = parsed[xml_name]
+        try:
+            write_playlist_file(
+                playlist_name,
+                map(unique_songs.__getitem__, order),
+                output_path=txt_path,
+                note="Synced from Apple Music XML (original order preserved)"
+            )
+            done += 1
+        except OSError as e:
+            print(color(f"❌ {xml_name}: {e}", FG_RED, BOLD))
+
+    print(color(f"✅ Synced {done}/{len(xml_files)} XML file(s) to TXT.", FG_GREEN, BOLD))
+
+
 # ---------- Main menu ----------
 
-def main_menu_choice():
+async def main_menu_choice():
+    import questionary
+
     print("\n")
-    return questionary.select(
+    return await questionary.select(
         "Choose an option:",
         choices=[
             questionary.Choice(
@@ -507,31 +768,59 @@ def main_menu_choice():
             questionary.Choice(
                 "Sync TXT from XML only (no edits, preserve order)", value="3"
             ),
+            questionary.Choice(
+                "Clear cached XML parses (force re-reading XML exports)", value="4"
+            ),
+            questionary.Choice(
+                "Batch sync TXTs from all XMLs in this folder (no Apple Music apply)", value="5"
+            ),
             questionary.Choice("Exit", value="0"),
         ],
         qmark="🎧",
-    ).ask()
+    ).ask_async()
 
 
 def main():
+    global _cwd
     print(color("\n Apple Music Playlist Tool ", FG_MAGENTA, BOLD)
       + color("(XML-aware, TXT master, AppleScript integration)", FG_CYAN))
     print(color("=" * 71, FG_MAGENTA))
-    while True:
-        choice = main_menu_choice()
-
-        if choice == "1":
-            work_on_playlist_flow()
-        elif choice == "2":
-            new_playlist_flow()
-        elif choice == "3":
-            sync_txt_from_xml_flow()
-        elif choice == "0":
-            print("Bye!")
-            break
-        else:
-            # This shouldn't happen with questionary, but just in case
-            print("Please choose 1, 2, 3, or 0.")
+
+    # The loop only runs while the menu is up. The flows are synchronous (their
+    # own prompts, osascript calls) and run on the main thread in between,
+    # so Ctrl-C and their questionary prompts behave as in a plain script.
+    loop = asyncio.new_event_loop()
+    try:
+        # Warm up the AppleScript bridge in the background while the first menu is drawn
+        warmup = loop.run_in_executor(None, importlib.import_module, "apple_music_bridge")
+
+        while True:
+            choice = loop.run_until_complete(main_menu_choice())
+            _cwd = os.getcwd()
+
+            if choice == "1":
+                work_on_playlist_flow()
+            elif choice == "2":
+                new_playlist_flow()
+            elif choice == "3":
+                sync_txt_from_xml_flow()
+            elif choice == "4":
+                removed = clear_xml_cache()
+                print(color(f"🧹 Cleared {removed} cached XML parse(s).", FG_GREEN, BOLD))
+            elif choice == "5":
+                batch_sync_flow()
+            elif choice == "0":
+                print("Bye!")
+                break
+            else:
+                # This shouldn't happen with questionary, but just in case
+                print("Please choose 1, 2, 3, 4, 5, or 0.")
+
+        loop.run_until_complete(warmup)
+    finally:
+        # The warm-up import is the executor's only job; it never blocks on input
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
 
 
 if __name__ == "__main__":
@@ -1,5 +1,13 @@
 #!/usr/bin/env python3
+import atexit
+import hashlib
+import json
+import os
 import subprocess
+import tempfile
+import threading
+import warnings
+from collections import namedtuple
 from colors import (
     FG_GREEN,
     FG_YELLOW,
@@ -9,8 +17,14 @@ from colors import (
     FG_GRAY,
     BOLD,
     RESET,
+    YELLOW_BOLD,
+    CYAN_BOLD,
+    RED_BOLD,
     color,
+    fastcolor,
 )
+from io_xml_txt import read_txt_playlist_file
+import bridge_pyobjc
 
 # Bridge between Python and the Music.app (Apple Music) via AppleScript.
 # NOTE: This version does NOT try to resolve or add Apple Music store URLs.
@@ -23,12 +37,71 @@ from colors import (
 # Any line that is *just* a URL (contains "://") will be skipped with a warning.
 # Lines with "[url=...]" prefixes are treated as metadata only: we strip the
 # prefix and just use the remaining label text for Title–Artist search.
+#
+# When PyObjC is installed, the same actions run through Scripting Bridge
+# (bridge_pyobjc.py) and the AppleScript below is only the fallback.
+
+APPLE_MUSIC_SCRIPT = """use AppleScript version "2.4"
+use framework "Foundation"
+use scripting additions
 
-APPLE_MUSIC_SCRIPT = """property pid_success : 0
+property pid_success : 0
 property pid_fail : 0
 property search_success : 0
 property search_fail : 0
 property skipped_lines : 0
+property log_buffer : {}
+property pid_index_ready : false
+property pid_index_text : ""
+property pid_list : {}
+property pid_refs : {}
+property pid_misses : ""
+property last_search_hits : 0
+property resolved_tracks : {}
+property resolved_kinds : {}
+
+-- log to stderr (one-off osascript) and keep a copy for the persistent bridge,
+-- which collects it with drainlog() after each request
+on logMsg(msg)
+    log msg
+    set end of log_buffer to (msg as text)
+end logMsg
+
+on drainlog()
+    set AppleScript's text item delimiters to linefeed
+    set logText to log_buffer as text
+    set AppleScript's text item delimiters to ""
+    set log_buffer to {}
+    return logText
+end drainlog
+
+on getDescription(playlistName)
+    tell application "Music"
+        try
+            set targetPlaylist to playlist playlistName
+            set descVal to description of targetPlaylist
+            if descVal is missing value then
+                return ""
+            else
+                return descVal
+            end if
+        on error errMsg number errNum
+            return "ERROR: " & errMsg & " (" & errNum & ")"
+        end try
+    end tell
+end getDescription
+
+on setDescription(playlistName, newDesc)
+    tell application "Music"
+        try
+            set targetPlaylist to playlist playlistName
+            set description of targetPlaylist to newDesc
+            return "OK"
+        on error errMsg number errNum
+            return "ERROR: " & errMsg & " (" & errNum & ")"
+        end try
+    end tell
+end setDescription
 
 on ensurePlaylistNamed(playlistName)
     tell application "Music"
@@ -49,18 +122,93 @@ on clearPlaylist(playlistName)
         try
             delete every track of targetPlaylist
         on error errMsg number errNum
-            log "WARNING: Error clearing playlist '" & playlistName & "': " & errMsg & " (" & errNum & ")"
+            my logMsg("WARNING: Error clearing playlist '" & playlistName & "': " & errMsg & " (" & errNum & ")")
         end try
+        return targetPlaylist
     end tell
 end clearPlaylist
 
+-- PID -> track index, built on the first lookup and reused by every later
+-- findTrackByPID call (across batches too, while the persistent bridge keeps
+-- this script loaded). pid_index_text is every library PID, one per line
+-- between linefeeds, so "offset of" finds a PID in one call and its position
+-- gives the index into pid_refs. pid_misses remembers PIDs already known to
+-- be missing so they are not looked up again.
+on resetPidIndex()
+    set pid_index_ready to false
+    set pid_index_text to ""
+    set pid_list to {}
+    set pid_refs to {}
+    set pid_misses to linefeed
+end resetPidIndex
+
+on buildPidIndex()
+    set pid_index_ready to true
+    tell application "Music"
+        try
+            set allPIDs to persistent ID of every track of library playlist 1
+            set allRefs to every track of library playlist 1
+        on error errMsg number errNum
+            my logMsg("WARNING: Could not index library PIDs, looking them up one by one: " & errMsg & " (" & errNum & ")")
+            return
+        end try
+    end tell
+    if (count of allPIDs) is not (count of allRefs) then return
+
+    set AppleScript's text item delimiters to linefeed
+    set pid_index_text to linefeed & (allPIDs as text) & linefeed
+    set AppleScript's text item delimiters to ""
+    set pid_list to allPIDs
+    set pid_refs to allRefs
+end buildPidIndex
+
+-- Index of thePID in pid_list, or 0 if it isn't in the library
+on pidIndexOf(thePID)
+    set needle to linefeed & thePID & linefeed
+    set pos to offset of needle in pid_index_text
+    if pos is 0 then return 0
+
+    -- Persistent IDs are 16 hex digits, so entries are normally 17 chars apart
+    set idx to (pos - 1) div 17 + 1
+    if (pos - 1) mod 17 is 0 and idx ≤ (count of pid_list) then
+        if item idx of pid_list is thePID then return idx
+    end if
+    -- Otherwise count the linefeeds before the match
+    set AppleScript's text item delimiters to linefeed
+    set idx to (count of text items of (text 1 thru pos of pid_index_text)) - 1
+    set AppleScript's text item delimiters to ""
+    return idx
+end pidIndexOf
+
 on findTrackByPID(thePID)
+    if pid_misses is "" then set pid_misses to linefeed
+    if pid_misses contains (linefeed & thePID & linefeed) then
+        set pid_fail to pid_fail + 1
+        my logMsg("WARNING: PID not found in library: " & thePID)
+        return missing value
+    end if
+
+    if not pid_index_ready then my buildPidIndex()
+    if pid_refs is not {} then
+        set idx to my pidIndexOf(thePID)
+        if idx > 0 then
+            set pid_success to pid_success + 1
+            return item idx of pid_refs
+        end if
+        set pid_fail to pid_fail + 1
+        set pid_misses to pid_misses & thePID & linefeed
+        my logMsg("WARNING: PID not found in library: " & thePID)
+        return missing value
+    end if
+
+    -- No index (library listing failed): ask Music for this PID only
     tell application "Music"
         try
             set theTracks to every track whose persistent ID is thePID
             if theTracks is {} then
                 set pid_fail to pid_fail + 1
-                log "WARNING: PID not found in library: " & thePID
+                set pid_misses to pid_misses & thePID & linefeed
+                my logMsg("WARNING: PID not found in library: " & thePID)
                 return missing value
             else
                 set t to item 1 of theTracks
@@ -69,35 +217,91 @@ on findTrackByPID(thePID)
             end if
         on error errMsg number errNum
             set pid_fail to pid_fail + 1
-            log "WARNING: Error in findTrackByPID for PID " & thePID & ": " & errMsg & " (" & errNum & ")"
+            my logMsg("WARNING: Error in findTrackByPID for PID " & thePID & ": " & errMsg & " (" & errNum & ")")
             return missing value
         end try
     end tell
 end findTrackByPID
 
-on addTrackToPlaylist(aTrack, playlistName)
-    tell application "Music"
-        set targetPlaylist to my ensurePlaylistNamed(playlistName)
-        try
-            duplicate aTrack to targetPlaylist
-        on error errMsg number errNum
-            log "WARNING: Error duplicating track to playlist '" & playlistName & "': " & errMsg & " (" & errNum & ")"
-        end try
-    end tell
+-- Matched tracks are only queued here ("pid" or "search" says where they came
+-- from); flushResolvedTracks duplicates them into the playlist in bulk.
+on addTrackToPlaylist(aTrack, kind)
+    set end of resolved_tracks to aTrack
+    set end of resolved_kinds to kind
 end addTrackToPlaylist
 
+-- targetPlaylist is resolved once per run by the caller; playlistName is for logs
+on flushResolvedTracks(targetPlaylist, playlistName)
+    set n to count of resolved_tracks
+    set chunkSize to 500
+    repeat with a from 1 to n by chunkSize
+        set b to a + chunkSize - 1
+        if b > n then set b to n
+        set chunkTracks to items a thru b of resolved_tracks
+        tell application "Music"
+            set countBefore to count of tracks of targetPlaylist
+            try
+                -- One Apple Event for the whole chunk, in list order
+                duplicate chunkTracks to targetPlaylist
+            on error errMsg number errNum
+                if (count of tracks of targetPlaylist) is not countBefore then
+                    -- Part of the chunk went in; retrying would add duplicates
+                    my logMsg("WARNING: Error duplicating tracks " & a & "-" & b & " to playlist '" & playlistName & "': " & errMsg & " (" & errNum & ")")
+                else
+                    -- Nothing was added: go one by one so a bad track only loses itself
+                    repeat with i from a to b
+                        try
+                            duplicate (item i of my resolved_tracks) to targetPlaylist
+                        on error errMsg number errNum
+                            if item i of my resolved_kinds is "search" then
+                                set search_success to search_success - 1
+                                set search_fail to search_fail + 1
+                                my logMsg("WARNING: Error duplicating search result to playlist '" & playlistName & "': " & errMsg & " (" & errNum & ")")
+                            else
+                                my logMsg("WARNING: Error duplicating track to playlist '" & playlistName & "': " & errMsg & " (" & errNum & ")")
+                            end if
+                        end try
+                    end repeat
+                end if
+            end try
+        end tell
+    end repeat
+    set resolved_tracks to {}
+    set resolved_kinds to {}
+end flushResolvedTracks
+
 on trimText(t)
-    set theChars to {space, tab, return, linefeed}
-    repeat while t is not "" and (t begins with space or t begins with tab or t begins with return or t begins with linefeed)
-        set t to text 2 thru -1 of t
+    -- Find the first and last non-whitespace characters, then slice once.
+    -- Test character by character: "id of t" counts code points, which
+    -- drift from the character indexes "text i thru j" takes once an emoji
+    -- or combining accent shows up.
+    set n to length of t
+    if n is 0 then return ""
+    set ws to {space, tab, linefeed, return}
+    set i to 1
+    repeat while i ≤ n
+        if character i of t is not in ws then exit repeat
+        set i to i + 1
     end repeat
-    repeat while t is not "" and (t ends with space or t ends with tab or t ends with return or t ends with linefeed)
-        set t to text 1 thru -2 of t
+    if i > n then return ""
+    set j to n
+    repeat while character j of t is in ws
+        set j to j - 1
     end repeat
-    return t
+    if i is 1 and j is n then return t
+    return text i thru j of t
 end trimText
 
-on searchAndAddTitleArtist(lineText, playlistName)
+on textOrEmpty(v)
+    if v is missing value then return ""
+    try
+        return v as text
+    on error
+        return ""
+    end try
+end textOrEmpty
+
+on searchAndAddTitleArtist(lineText)
     set titlePart to lineText
     set artistPart to ""
 
@@ -116,85 +320,144 @@ on searchAndAddTitleArtist(lineText, playlistName)
     end if
     set AppleScript's text item delimiters to ""
 
-    set titlePart to my trimText(titlePart)
-    set artistPart to my trimText(artistPart)
+    my searchAndAddParts(my trimText(titlePart), my trimText(artistPart))
+end searchAndAddTitleArtist
 
+-- Run one library search for query and pick the best result for
+-- titlePart / artistPart (missing value if none). Sets last_search_hits.
+on searchBestMatch(query, titlePart, artistPart)
     tell application "Music"
-        set searchResults to (search library playlist 1 for titlePart only songs)
-        if searchResults is {} then
-            set search_fail to search_fail + 1
-            log "WARNING: No search results for title '" & titlePart & "' (artist hint: '" & artistPart & "')"
-            return
-        end if
+        set searchResults to (search library playlist 1 for query only songs)
+        set last_search_hits to count of searchResults
+        if searchResults is {} then return missing value
 
         set chosenTrack to missing value
+        set resultCount to count of searchResults
 
-        -- First pass: name contains title AND, if artistPart is present, artist contains artistPart
-        repeat with t in searchResults
-            set tName to ""
-            set tArtist to ""
-            try
-                set tName to name of t as text
-            end try
-            try
-                set tArtist to artist of t as text
-            end try
+        -- Read every candidate's name and artist up front (one bulk request per
+        -- property when Music accepts it, else a single pass over the results),
+        -- so the match passes below only compare strings in memory.
+        set resNames to missing value
+        set resArtists to missing value
+        try
+            set resNames to name of searchResults
+            set resArtists to artist of searchResults
+        end try
+        if class of resNames is not list or class of resArtists is not list or ¬
+            (count of resNames) is not resultCount or (count of resArtists) is not resultCount then
+            set resNames to {}
+            set resArtists to {}
+            repeat with t in searchResults
+                set tName to missing value
+                set tArtist to missing value
+                try
+                    set tName to name of t
+                end try
+                try
+                    set tArtist to artist of t
+                end try
+                set end of resNames to tName
+                set end of resArtists to tArtist
+            end repeat
+        end if
+
+        -- One pass: the first result whose name contains titlePart and (if given)
+        -- whose artist contains artistPart wins; otherwise fall back to the first
+        -- title-only match seen along the way
+        set fallbackTrack to missing value
+        repeat with i from 1 to resultCount
+            set tName to my textOrEmpty(item i of resNames)
 
             if tName is not "" then
                 ignoring case
                     if tName contains titlePart then
                         if artistPart is "" then
-                            set chosenTrack to t
+                            set chosenTrack to item i of searchResults
                             exit repeat
-                        else
-                            if tArtist contains artistPart then
-                                set chosenTrack to t
-                                exit repeat
-                            end if
+                        else if my textOrEmpty(item i of resArtists) contains artistPart then
+                            set chosenTrack to item i of searchResults
+                            exit repeat
+                        else if fallbackTrack is missing value then
+                            set fallbackTrack to item i of searchResults
                         end if
                     end if
                 end ignoring
             end if
         end repeat
+        if chosenTrack is missing value then set chosenTrack to fallbackTrack
 
-        -- Second pass: if still missing, try title-only strict match (name contains titlePart)
-        if chosenTrack is missing value then
-            repeat with t in searchResults
-                set tName to ""
-                try
-                    set tName to name of t as text
-                end try
-                if tName is not "" then
-                    ignoring case
-                        if tName contains titlePart then
-                            set chosenTrack to t
-                            exit repeat
-                        end if
-                    end ignoring
-                end if
-            end repeat
+        return chosenTrack
+    end tell
+end searchBestMatch
+
+-- "Intro (feat. X)" -> "Intro"; text unchanged if there is no " (" / " [" suffix
+on stripBracketSuffix(t)
+    set cut to 0
+    repeat with opener in {" (", " ["}
+        set pos to offset of (opener as text) in t
+        if pos > 1 and (cut is 0 or pos < cut) then set cut to pos
+    end repeat
+    if cut is 0 then return t
+    return text 1 thru (cut - 1) of t
+end stripBracketSuffix
+
+on searchAndAddParts(titlePart, artistPart)
+    set anyHits to false
+    set chosenTrack to missing value
+
+    -- 1) "title artist" as one query: Music matches both, so far fewer results
+    if artistPart is not "" then
+        set chosenTrack to my searchBestMatch(titlePart & " " & artistPart, titlePart, artistPart)
+        if last_search_hits > 0 then set anyHits to true
+    end if
+
+    -- 2) title only
+    if chosenTrack is missing value then
+        set chosenTrack to my searchBestMatch(titlePart, titlePart, artistPart)
+        if last_search_hits > 0 then set anyHits to true
+    end if
+
+    -- 3) title without a bracketed suffix such as " (feat. X)"
+    if chosenTrack is missing value then
+        set shortTitle to my stripBracketSuffix(titlePart)
+        if shortTitle is not titlePart then
+            set chosenTrack to my searchBestMatch(shortTitle, shortTitle, artistPart)
+            if last_search_hits > 0 then set anyHits to true
         end if
+    end if
 
-        if chosenTrack is missing value then
-            set search_fail to search_fail + 1
-            log "WARNING: No suitable match for title '" & titlePart & "' (artist hint: '" & artistPart & "')"
-            return
+    if chosenTrack is missing value then
+        set search_fail to search_fail + 1
+        if anyHits then
+            my logMsg("WARNING: No suitable match for title '" & titlePart & "' (artist hint: '" & artistPart & "')")
+        else
+            my logMsg("WARNING: No search results for title '" & titlePart & "' (artist hint: '" & artistPart & "')")
         end if
+        return
+    end if
 
-        set targetPlaylist to my ensurePlaylistNamed(playlistName)
-        try
-            duplicate chosenTrack to targetPlaylist
-            set search_success to search_success + 1
-        on error errMsg number errNum
-            set search_fail to search_fail + 1
-            log "WARNING: Error duplicating search result to playlist '" & playlistName & "': " & errMsg & " (" & errNum & ")"
-        end try
-    end tell
-end searchAndAddTitleArtist
+    set search_success to search_success + 1
+    my addTrackToPlaylist(chosenTrack, "search")
+end searchAndAddParts
+
+-- Split "[pid=VALUE] rest" / "[url=VALUE] rest" into {VALUE, rest} (rest skips
+-- the "] "), or missing value if VALUE is empty or there is no "]".
+-- Uses NSString's native search instead of AppleScript's "offset of".
+on splitBracketPrefix(lineText)
+    set nsLine to current application's NSString's stringWithString:lineText
+    set r to nsLine's rangeOfString:"]"
+    set closeAt to location of r
+    if (|length| of r) is 0 or closeAt < 6 then return missing value
+    set theValue to (nsLine's substringWithRange:{location:5, |length|:closeAt - 5}) as text
+    set theRest to ""
+    if (nsLine's |length|()) > closeAt + 2 then
+        set theRest to (nsLine's substringFromIndex:(closeAt + 2)) as text
+    end if
+    return {theValue, theRest}
+end splitBracketPrefix
 
-on addLineToPlaylist(lineText, playlistName)
+on addLineToPlaylist(lineText)
     set lineText to lineText as text
-    set playlistName to playlistName as text
 
     set lineText to my trimText(lineText)
     if lineText is "" then
@@ -208,17 +471,13 @@ on addLineToPlaylist(lineText, playlistName)
 
     -- 1) PID prefix: [pid=...]
     if lineText starts with "[pid=" then
-        set closeBracket to offset of "]" in lineText
-        if closeBracket > 6 then
-            set thePID to text 6 thru (closeBracket - 1) of lineText
-            set coreLabel to ""
-            if (length of lineText) > (closeBracket + 1) then
-                set coreLabel to text (closeBracket + 2) thru -1 of lineText -- skip "] "
-            end if
+        set parts to my splitBracketPrefix(lineText)
+        if parts is not missing value then
+            set {thePID, coreLabel} to parts
 
             set theTrack to my findTrackByPID(thePID)
             if theTrack is not missing value then
-                my addTrackToPlaylist(theTrack, playlistName)
+                my addTrackToPlaylist(theTrack, "pid")
                 return
             end if
 
@@ -231,7 +490,7 @@ on addLineToPlaylist(lineText, playlistName)
                 return
             end if
         else
-            log "WARNING: Malformed PID prefix in line: " & lineText
+            my logMsg("WARNING: Malformed PID prefix in line: " & lineText)
             -- Fall through and treat as non-PID line
         end if
     end if
@@ -239,10 +498,10 @@ on addLineToPlaylist(lineText, playlistName)
     -- 2) [url=...] prefix as metadata ONLY:
     --    We ignore the URL and just use the remaining label text.
     if lineText starts with "[url=" then
-        set closeBracket2 to offset of "]" in lineText
-        if closeBracket2 > 6 then
-            if (length of lineText) > (closeBracket2 + 1) then
-                set lineText to text (closeBracket2 + 2) thru -1 of lineText -- skip "] "
+        set parts to my splitBracketPrefix(lineText)
+        if parts is not missing value then
+            if item 2 of parts is not "" then
+                set lineText to item 2 of parts
             else
                 -- No text after [url=...]; nothing to search for
                 set skipped_lines to skipped_lines + 1
@@ -253,17 +512,16 @@ on addLineToPlaylist(lineText, playlistName)
 
     -- 3) Bare URL-only lines are not supported; log + skip
     if lineText contains "://" then
-        log "WARNING: URL-only line not supported. Please add this track to your Library and use a Title – Artist or PID label instead: " & lineText
+        my logMsg("WARNING: URL-only line not supported. Please add this track to your Library and use a Title – Artist or PID label instead: " & lineText)
         set skipped_lines to skipped_lines + 1
         return
     end if
 
     -- 4) Title – Artist fallback
-    my searchAndAddTitleArtist(lineText, playlistName)
+    my searchAndAddTitleArtist(lineText)
 end addLineToPlaylist
 
-on applyTxtFileToPlaylist(txtPath, playlistName, shouldClear)
-    set txtPath to txtPath as text
+on applyLinesToPlaylist(theLines, playlistName, shouldClear)
     set playlistName to playlistName as text
 
     -- Reset counters for this run
@@ -272,12 +530,116 @@ on applyTxtFileToPlaylist(txtPath, playlistName, shouldClear)
     set search_success to 0
     set search_fail to 0
     set skipped_lines to 0
+    set resolved_tracks to {}
+    set resolved_kinds to {}
 
+    -- Resolve the playlist once; the matched tracks are duplicated into this reference
     if shouldClear then
-        my clearPlaylist(playlistName)
+        set targetPlaylist to my clearPlaylist(playlistName)
     else
-        my ensurePlaylistNamed(playlistName)
+        set targetPlaylist to my ensurePlaylistNamed(playlistName)
+    end if
+
+    repeat with lineText in theLines
+        my addLineToPlaylist(lineText)
+    end repeat
+    my flushResolvedTracks(targetPlaylist, playlistName)
+
+    -- Summary log
+    my logMsg("SUMMARY: PID success=" & pid_success & ", PID fail=" & pid_fail & ¬
+        ", Search success=" & search_success & ", Search fail=" & search_fail & ¬
+        ", Skipped lines=" & skipped_lines)
+end applyLinesToPlaylist
+
+-- One record pre-parsed by Python (parse_txt_line): kind is "pid", "label",
+-- "skip" (titlePart holds an optional warning) or "note" (log titlePart only)
+on addSpecToPlaylist(kind, thePID, titlePart, artistPart)
+    if kind is "pid" then
+        set theTrack to my findTrackByPID(thePID)
+        if theTrack is not missing value then
+            my addTrackToPlaylist(theTrack, "pid")
+        else if titlePart is not "" then
+            my searchAndAddParts(titlePart, artistPart)
+        else
+            set skipped_lines to skipped_lines + 1
+        end if
+    else if kind is "pidwarn" then
+        set theTrack to my findTrackByPID(thePID)
+        if theTrack is not missing value then
+            my addTrackToPlaylist(theTrack, "pid")
+        else
+            my logMsg(titlePart)
+            set skipped_lines to skipped_lines + 1
+        end if
+    else if kind is "label" then
+        my searchAndAddParts(titlePart, artistPart)
+    else if kind is "skip" then
+        if titlePart is not "" then my logMsg(titlePart)
+        set skipped_lines to skipped_lines + 1
+    else if kind is "note" then
+        my logMsg(titlePart)
+    end if
+end addSpecToPlaylist
+
+-- specFields is the flat list kind, pid, title, artist, kind, pid, ...
+on applySpecsToPlaylist(specFields, playlistName, shouldClear)
+    set playlistName to playlistName as text
+
+    -- Reset counters for this run
+    set pid_success to 0
+    set pid_fail to 0
+    set search_success to 0
+    set search_fail to 0
+    set skipped_lines to 0
+    set resolved_tracks to {}
+    set resolved_kinds to {}
+
+    -- Resolve the playlist once; the matched tracks are duplicated into this reference
+    if shouldClear then
+        set targetPlaylist to my clearPlaylist(playlistName)
+    else
+        set targetPlaylist to my ensurePlaylistNamed(playlistName)
+    end if
+
+    repeat with k from 1 to (count of specFields) - 3 by 4
+        my addSpecToPlaylist(item k of specFields as text, item (k + 1) of specFields as text, ¬
+            item (k + 2) of specFields as text, item (k + 3) of specFields as text)
+    end repeat
+    my flushResolvedTracks(targetPlaylist, playlistName)
+
+    -- Summary log
+    my logMsg("SUMMARY: PID success=" & pid_success & ", PID fail=" & pid_fail & ¬
+        ", Search success=" & search_success & ", Search fail=" & search_fail & ¬
+        ", Skipped lines=" & skipped_lines)
+    return targetPlaylist
+end applySpecsToPlaylist
+
+on setDescriptionOf(targetPlaylist, newDesc)
+    tell application "Music"
+        try
+            set description of targetPlaylist to newDesc
+            return "OK"
+        on error errMsg number errNum
+            return "ERROR: " & errMsg & " (" & errNum & ")"
+        end try
+    end tell
+end setDescriptionOf
+
+-- jsonText is a JSON array of TXT lines (json.dumps on the Python side)
+on applyLinesJSON(jsonText, playlistName, shouldClear)
+    set theString to current application's NSString's stringWithString:jsonText
+    set theData to theString's dataUsingEncoding:(current application's NSUTF8StringEncoding)
+    set {theArray, theError} to current application's NSJSONSerialization's ¬
+        JSONObjectWithData:theData options:0 |error|:(reference)
+    if theArray is missing value then
+        my logMsg("WARNING: Could not decode lines JSON: " & ((theError's localizedDescription()) as text))
+        return
     end if
+    my applyLinesToPlaylist(theArray as list, playlistName, shouldClear)
+end applyLinesJSON
+
+on applyTxtFileToPlaylist(txtPath, playlistName, shouldClear)
+    set txtPath to txtPath as text
 
     -- Read the TXT file contents
     set f to POSIX file txtPath
@@ -292,77 +654,513 @@ on applyTxtFileToPlaylist(txtPath, playlistName, shouldClear)
     set theLines to paragraphs of fileContents
     set AppleScript's text item delimiters to ""
 
-    repeat with lineText in theLines
-        my addLineToPlaylist(lineText, playlistName)
-    end repeat
-
-    -- Summary log
-    log "SUMMARY: PID success=" & pid_success & ", PID fail=" & pid_fail & ¬
-        ", Search success=" & search_success & ", Search fail=" & search_fail & ¬
-        ", Skipped lines=" & skipped_lines
+    -- One whole-file run: index the library fresh for it
+    my resetPidIndex()
+    my applyLinesToPlaylist(theLines, playlistName, shouldClear)
 end applyTxtFileToPlaylist
 
-on run argv
-    if (count of argv) is 0 then return
+on dispatch(argv)
+    if (count of argv) is 0 then return ""
     set action to item 1 of argv
 
     if action is "applyFile" then
-        if (count of argv) < 4 then return
+        if (count of argv) < 4 then return ""
         set txtPath to item 2 of argv
         set playlistName to item 3 of argv
         set clearFlag to item 4 of argv
         set shouldClear to (clearFlag is "1")
         my applyTxtFileToPlaylist(txtPath, playlistName, shouldClear)
 
+    else if action is "applyParsedWithDescription" then
+        -- applyParsed, then set the description on the playlist it just resolved
+        if (count of argv) < 4 then return ""
+        set playlistName to item 2 of argv
+        set shouldClear to (item 3 of argv is "1")
+        set newDesc to item 4 of argv
+        if (count of argv) > 4 then
+            set specFields to items 5 thru -1 of argv
+        else
+            set specFields to {}
+        end if
+        set targetPlaylist to my applySpecsToPlaylist(specFields, playlistName, shouldClear)
+        return my setDescriptionOf(targetPlaylist, newDesc)
+
+    else if action is "addLinesJSON" then
+        if (count of argv) < 3 then return ""
+        my applyLinesJSON(item 2 of argv, item 3 of argv, false)
+
+    else if action is "applyParsed" then
+        if (count of argv) < 3 then return ""
+        set playlistName to item 2 of argv
+        set shouldClear to (item 3 of argv is "1")
+        if (count of argv) > 3 then
+            set specFields to items 4 thru -1 of argv
+        else
+            set specFields to {}
+        end if
+        my applySpecsToPlaylist(specFields, playlistName, shouldClear)
+
     else if action is "addLine" then
-        if (count of argv) < 3 then return
+        if (count of argv) < 3 then return ""
         set lineText to item 2 of argv
         set playlistName to item 3 of argv
-        my addLineToPlaylist(lineText, playlistName)
+        set targetPlaylist to my ensurePlaylistNamed(playlistName)
+        set resolved_tracks to {}
+        set resolved_kinds to {}
+        my addLineToPlaylist(lineText)
+        my flushResolvedTracks(targetPlaylist, playlistName)
+
+    else if action is "resetIndex" then
+        my resetPidIndex()
 
     else if action is "clear" then
-        if (count of argv) < 2 then return
+        if (count of argv) < 2 then return ""
         set playlistName to item 2 of argv
         my clearPlaylist(playlistName)
+
+    else if action is "getDescription" then
+        if (count of argv) < 2 then return ""
+        return my getDescription(item 2 of argv)
+
+    else if action is "setDescription" then
+        if (count of argv) < 3 then return ""
+        return my setDescription(item 2 of argv, item 3 of argv)
     end if
+    return ""
+end dispatch
+
+on run argv
+    return my dispatch(argv)
 end run"""
 
-def _run_osascript(args):
+# Encoded once: piped to osascript / osacompile and hashed for the compile cache
+_APPLE_MUSIC_SCRIPT_BYTES = APPLE_MUSIC_SCRIPT.encode("utf-8")
+
+# One TXT line, parsed in Python so AppleScript only has to talk to Music.app.
+# kind: "pid"   -> look up pid, fall back to title/artist search if given
+#       "pidwarn" -> look up pid; if it's missing, skip and log title (a warning)
+#       "label" -> title/artist search
+#       "skip"  -> count as skipped; title holds an optional warning to log
+#       "note"  -> only log title (then the next record handles the line)
+TrackSpec = namedtuple("TrackSpec", "kind pid title artist")
+
+_TRIM_CHARS = " \t\r\n"
+
+
+def _split_title_artist(text):
+    for sep in (" – ", " - "):
+        parts = text.split(sep)
+        if len(parts) > 1:
+            return parts[0].strip(_TRIM_CHARS), parts[1].strip(_TRIM_CHARS)
+    return text.strip(_TRIM_CHARS), ""
+
+
+def _parse_label(text):
+    """
+    Parse the label part of a line (after any PID): [url=...] prefix is
+    metadata only, bare URLs are skipped, the rest is 'Title – Artist'.
+    """
+    if text[:5].lower() == "[url=":
+        closing = text.find("]")
+        if closing > 5:
+            text = text[closing + 2:]
+            if not text:
+                return [TrackSpec("skip", "", "", "")]
+
+    if "://" in text:
+        return [TrackSpec(
+            "skip", "",
+            "WARNING: URL-only line not supported. Please add this track to your "
+            "Library and use a Title – Artist or PID label instead: " + text,
+            "",
+        )]
+
+    title, artist = _split_title_artist(text)
+    return [TrackSpec("label", "", title, artist)]
+
+
+def parse_txt_line(line):
+    """
+    Turn one TXT line into TrackSpec record(s), following the same rules as
+    addLineToPlaylist in APPLE_MUSIC_SCRIPT.
+    """
+    line = line.strip(_TRIM_CHARS)
+    if not line or line[0] == "#":
+        return [TrackSpec("skip", "", "", "")]
+
+    notes = []
+    if line[:5].lower() == "[pid=":
+        closing = line.find("]")
+        if closing > 5:
+            pid = line[5:closing]
+            specs = _parse_label(line[closing + 2:]) if len(line) > closing + 2 else []
+            if specs and specs[0].kind == "label":
+                return [TrackSpec("pid", pid, specs[0].title, specs[0].artist)]
+            if specs and specs[0].title:
+                # e.g. a URL-only label: warn about it only if the PID misses
+                return [TrackSpec("pidwarn", pid, specs[0].title, "")]
+            # No usable label to fall back to if the PID isn't found
+            return [TrackSpec("pid", pid, "", "")]
+        notes.append(TrackSpec("note", "", "WARNING: Malformed PID prefix in line: " + line, ""))
+
+    return notes + _parse_label(line)
+
+
+def parse_txt_playlist(lines):
+    """Parse TXT lines into a flat list of TrackSpec records."""
+    specs = []
+    for line in lines:
+        specs.extend(parse_txt_line(line))
+    return specs
+
+
+# Lines are pushed to Music.app in batches so one AppleScript call never has
+# to carry (or time out on) the whole playlist.
+BATCH_SIZE = 150
+
+
+# JXA driver for the persistent bridge: compiles the AppleScript (argv[0]) once
+# with OSAKit, then serves one JSON request per stdin line ({"args": [...]}) by
+# calling its dispatch() handler, answering with one JSON line on stdout.
+# Requests are pure ASCII (json.dumps escapes the rest), so reading stdin in
+# arbitrary chunks can't split a character.
+_JXA_SERVER = r"""
+ObjC.import('Foundation');
+ObjC.import('OSAKit');
+
+function send(obj) {
+    var out = $.NSFileHandle.fileHandleWithStandardOutput;
+    out.writeData($(JSON.stringify(obj) + "\n").dataUsingEncoding($.NSUTF8StringEncoding));
+}
+
+function errorText(err) {
+    var info = ObjC.deepUnwrap(err[0]) || {};
+    return String(info.OSAScriptErrorMessageKey || info.OSAScriptErrorMessage || "AppleScript error");
+}
+
+function call(script, name, args) {
+    var list = $.NSAppleEventDescriptor.listDescriptor;
+    for (var i = 0; i < args.length; i++) {
+        list.insertDescriptorAtIndex($.NSAppleEventDescriptor.descriptorWithString($(String(args[i]))), i + 1);
+    }
+    var err = Ref();
+    var res = script.executeHandlerWithNameArgumentsError($(name), $([list]), err);
+    if (!res || res.isNil()) {
+        return {ok: false, error: errorText(err)};
+    }
+    var text = res.stringValue;
+    return {ok: true, result: (!text || text.isNil()) ? "" : text.js};
+}
+
+function run(argv) {
+    var lang = $.OSALanguage.languageForName($("AppleScript"));
+    var script = $.OSAScript.alloc.initWithSourceLanguage($(argv[0]), lang);
+    var err = Ref();
+    if (!script.compileAndReturnError(err)) {
+        send({ready: false, error: errorText(err)});
+        return;
+    }
+    send({ready: true});
+
+    var input = $.NSFileHandle.fileHandleWithStandardInput;
+    var buf = "";
+    while (true) {
+        var data = input.availableData;
+        if (data.length === 0) break;  // EOF: Python closed the pipe
+        buf += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+        var nl;
+        while ((nl = buf.indexOf("\n")) >= 0) {
+            var line = buf.slice(0, nl);
+            buf = buf.slice(nl + 1);
+            if (!line) continue;
+            // call() already passes its list as dispatch's single argv parameter
+            var resp = call(script, "dispatch", JSON.parse(line).args);
+            var log = script.executeHandlerWithNameArgumentsError($("drainlog"), $([]), Ref());
+            resp.log = (log && !log.isNil() && !log.stringValue.isNil()) ? log.stringValue.js : "";
+            send(resp);
+        }
+    }
+}
+"""
+
+
+class _OsaBridge:
+    """
+    A single long-lived osascript (JXA) process that keeps APPLE_MUSIC_SCRIPT
+    compiled, so each call costs one pipe round-trip instead of launching
+    osascript and re-parsing the script.
+
+    If the process can't be started (e.g. osascript/OSAKit unavailable), the
+    bridge disables itself and _run_osascript falls back to one-off osascript.
+    """
+
+    def __init__(self, script=APPLE_MUSIC_SCRIPT):
+        # AppleScript source with dispatch(argv) / drainlog() handlers
+        self._script = script
+        self._proc = None
+        self._disabled = False
+        # Calls may come from more than one thread (e.g. the background description fetch)
+        self._lock = threading.Lock()
+
+    def _start(self):
+        proc = subprocess.Popen(
+            ["osascript", "-l", "JavaScript", "-e", _JXA_SERVER, self._script],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        line = proc.stdout.readline()
+        try:
+            hello = json.loads(line) if line else {}
+        except ValueError:
+            hello = {}
+        if not hello.get("ready"):
+            proc.kill()
+            proc.wait()
+            raise OSError(hello.get("error") or "osascript bridge did not start")
+        self._proc = proc
+
+    def call(self, args):
+        """
+        Run one dispatch(argv) request.
+        Returns (returncode, stdout, stderr) like _run_osascript,
+        or None if the bridge is unavailable.
+        """
+        with self._lock:
+            if self._disabled:
+                return None
+            if self._proc is None or self._proc.poll() is not None:
+                try:
+                    self._start()
+                except OSError:
+                    self._disabled = True
+                    return None
+
+            try:
+                request = json.dumps({"args": [str(a) for a in args]}) + "\n"
+                self._proc.stdin.write(request.encode("ascii"))
+                self._proc.stdin.flush()
+                line = self._proc.stdout.readline()
+                if not line:
+                    raise OSError("osascript bridge exited")
+                resp = json.loads(line)
+            except (OSError, ValueError) as e:
+                # Don't re-run the request (it may have partly happened); just
+                # report it and start a fresh process on the next call.
+                self._kill()
+                return 1, "", f"osascript bridge error: {e}"
+
+        err = resp.get("log", "")
+        if not resp.get("ok"):
+            err = (err + "\n" + resp.get("error", "")).strip()
+            return 1, resp.get("result", "").strip(), err
+        return 0, resp.get("result", "").strip(), err.strip()
+
+    def is_alive(self):
+        """True if a bridge process is running (and so may hold state)."""
+        with self._lock:
+            return self._proc is not None and self._proc.poll() is None
+
+    def _kill(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def close(self):
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+                self._proc.wait()
+            self._proc = None
+
+
+_BRIDGE = _OsaBridge()
+atexit.register(_BRIDGE.close)
+
+
+# Compiled copies of APPLE_MUSIC_SCRIPT for one-off osascript runs
+SCRIPT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "apple-music-pl-generator")
+
+_compiled_script = None  # path of the .scpt, "" if osacompile failed
+_compile_lock = threading.Lock()
+
+
+def _compiled_script_path():
+    """
+    Path of APPLE_MUSIC_SCRIPT compiled with osacompile, or None if that
+    isn't possible. The .scpt is cached on disk under a hash of the source,
+    so it is rebuilt only when the script changes.
+    """
+    global _compiled_script
+    with _compile_lock:
+        if _compiled_script is not None:
+            return _compiled_script or None
+
+        key = hashlib.blake2b(_APPLE_MUSIC_SCRIPT_BYTES, digest_size=16).hexdigest()
+        name = f"bridge-{key}.scpt"
+        path = os.path.join(SCRIPT_CACHE_DIR, name)
+        if not os.path.exists(path):
+            tmp_path = os.path.join(SCRIPT_CACHE_DIR, f"bridge-{key}.{os.getpid()}.tmp.scpt")
+            try:
+                os.makedirs(SCRIPT_CACHE_DIR, exist_ok=True)
+                proc = subprocess.run(
+                    ["osacompile", "-o", tmp_path, "-"],
+                    input=_APPLE_MUSIC_SCRIPT_BYTES,
+                    capture_output=True,
+                )
+                if proc.returncode != 0:
+                    raise OSError(proc.stderr.decode("utf-8", errors="replace").strip())
+                os.replace(tmp_path, path)
+            except OSError:
+                _compiled_script = ""
+                return None
+
+            # Drop scripts compiled from older versions of the source
+            for old_name in os.listdir(SCRIPT_CACHE_DIR):
+                if old_name.startswith("bridge-") and old_name.endswith(".scpt") and old_name != name:
+                    try:
+                        os.remove(os.path.join(SCRIPT_CACHE_DIR, old_name))
+                    except OSError:
+                        pass
+
+        _compiled_script = path
+        return path
+
+
+def _stream_osascript(cmd, script_input, on_log):
+    """
+    Run a one-off osascript, passing each stderr (log) line to on_log as soon
+    as it is written instead of collecting it. Returns (returncode, stdout, "").
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if script_input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    def pump_stderr():
+        for line in iter(proc.stderr.readline, b""):
+            on_log(line.decode("utf-8", errors="replace").rstrip("\n"))
+
+    reader = threading.Thread(target=pump_stderr, daemon=True)
+    reader.start()
+    if script_input is not None:
+        proc.stdin.write(script_input)
+        proc.stdin.close()
+    out = proc.stdout.read()
+    proc.wait()
+    reader.join()
+    return proc.returncode, out.decode("utf-8", errors="replace").strip(), ""
+
+
+def _run_osascript(args, on_log=None):
     """
     Low-level helper to run our AppleScript with arguments.
+    Uses the persistent bridge when available, otherwise a one-off osascript
+    (on the precompiled script if possible, else piping the source).
+    If on_log is given, a one-off osascript's log lines are passed to it as
+    they arrive instead of being returned in stderr. The persistent bridge
+    cannot stream: its handler call blocks until the action finishes, so its
+    log comes back in stderr at the end as before.
     Returns (returncode, stdout, stderr).
     """
-    proc = subprocess.run(
-        ["osascript", "-", *args],
-        input=APPLE_MUSIC_SCRIPT,
-        capture_output=True,
-        text=True,
-    )
+    result = _BRIDGE.call(args)
+    if result is not None:
+        return result
+
+    compiled = _compiled_script_path()
+    if on_log is not None:
+        if compiled:
+            return _stream_osascript(["osascript", compiled, *args], None, on_log)
+        return _stream_osascript(["osascript", "-", *args], _APPLE_MUSIC_SCRIPT_BYTES, on_log)
+
+    if compiled:
+        proc = subprocess.run(
+            ["osascript", compiled, *args],
+            capture_output=True,
+        )
+    else:
+        proc = subprocess.run(
+            ["osascript", "-", *args],
+            input=_APPLE_MUSIC_SCRIPT_BYTES,
+            capture_output=True,
+        )
     rc = proc.returncode
-    out = proc.stdout.strip()
-    err = proc.stderr.strip()
+    out = proc.stdout.decode("utf-8", errors="replace").strip()
+    err = proc.stderr.decode("utf-8", errors="replace").strip()
     return rc, out, err
 
 
-def call_applescript_add_line(line_text: str, playlist_name: str) -> None:
+def _run_music_action(args, on_log=None):
     """
-    Call AppleScript 'addLineToPlaylist' via the run handler (single line).
-    Mostly for debugging; the batch flow is preferred.
+    Run one action (same argv layout as the AppleScript dispatch handler).
+    Prefers direct Scripting Bridge calls (bridge_pyobjc) when PyObjC is
+    installed, otherwise goes through AppleScript.
+    on_log: see _run_osascript.
+    Returns (returncode, stdout, stderr).
+    """
+    result = bridge_pyobjc.dispatch(args)
+    if result is not None:
+        return result
+    return _run_osascript(args, on_log=on_log)
+
+
+# Bigger addLines payloads go through a temp file instead of one argv string
+_MAX_JSON_ARG_BYTES = 200_000
+
+
+def call_applescript_add_lines(lines, playlist_name: str) -> None:
+    """
+    Append several TXT lines to a playlist in one call (no clearing).
+    The lines are sent as one JSON array ('addLinesJSON' action), so any
+    number of them costs a single AppleScript invocation. Very large batches
+    go through a temporary file and the 'applyFile' action instead.
     """
-    rc, out, err = _run_osascript(["addLine", line_text, playlist_name])
+    payload = json.dumps(list(lines))
+    if len(payload) <= _MAX_JSON_ARG_BYTES:
+        rc, out, err = _run_music_action(["addLinesJSON", payload, playlist_name])
+    else:
+        fd, tmp_path = tempfile.mkstemp(prefix="apple-music-lines-", suffix=".txt")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines))
+            rc, out, err = _run_music_action(["applyFile", tmp_path, playlist_name, "0"])
+        finally:
+            os.remove(tmp_path)
+
     if err:
-        print(f"[AppleScript log addLine]\n{err}")
+        print(f"[AppleScript log addLines]\n{err}")
     if out:
-        print(f"[AppleScript output addLine]\n{out}")
+        print(f"[AppleScript output addLines]\n{out}")
     if rc != 0:
-        print(f"[AppleScript error addLine] returncode={rc}")
+        print(f"[AppleScript error addLines] returncode={rc}")
+
+
+def call_applescript_add_line(line_text: str, playlist_name: str) -> None:
+    """
+    Deprecated: use call_applescript_add_lines, which takes any number of
+    lines in one call. Calling this in a loop costs one invocation per line.
+    """
+    warnings.warn(
+        "call_applescript_add_line is deprecated; use call_applescript_add_lines",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    call_applescript_add_lines([line_text], playlist_name)
 
 
 def call_applescript_clear_playlist(playlist_name: str) -> None:
     """
     Call AppleScript 'clearPlaylist' to empty the target playlist (creating it if needed).
     """
-    rc, out, err = _run_osascript(["clear", playlist_name])
+    rc, out, err = _run_music_action(["clear", playlist_name])
     if err:
         print(f"[AppleScript log clear]\n{err}")
     if out:
@@ -375,7 +1173,8 @@ def apply_playlist_to_apple_music_from_txt(
     playlist_name: str,
     txt_path: str,
     clear_first: bool = True,
-) -> None:
+    description=None,
+):
     """
     Read your final TXT playlist and apply it to Music.app.
 
@@ -387,13 +1186,19 @@ def apply_playlist_to_apple_music_from_txt(
       - Bare URL lines are skipped with a warning; no attempt is made to resolve
         Apple Music store URLs automatically. If you want a song, add it to
         your Library first (or give it a PID from an XML export / helper script).
+      - Songs are sent in batches of BATCH_SIZE. The first batch that fails
+        stops the run: it may have been partly applied, and re-sending it (or
+        carrying on past it) would duplicate songs or break the round-robin
+        order, so the playlist is left as-is and the failure is reported.
 
     Parameters:
       playlist_name: name of the target user playlist in Music.app
       txt_path: path to the TXT file generated by the Python tool
       clear_first: if True, the target playlist is cleared before rebuilding
+      description: if given, also set the playlist description, in the same
+        call as the last batch
+    Returns the description update result ("OK" / "ERROR: ...") or None.
     """
-    clear_flag = "1" if clear_first else "0"
     print(
         color("Applying TXT ", FG_CYAN)
         + color(f"'{txt_path}'", FG_MAGENTA)
@@ -402,31 +1207,128 @@ def apply_playlist_to_apple_music_from_txt(
         + color(f"(clear_first={clear_first})...", FG_CYAN)
     )
 
-    rc, out, err = _run_osascript(["applyFile", txt_path, playlist_name, clear_flag])
+    # Rebuild the PID -> track index (kept between batches) for this run.
+    # Only a backend that is already running holds one; don't start a
+    # process just to empty it.
+    bridge_pyobjc.reset_pid_index()
+    if _BRIDGE.is_alive():
+        _BRIDGE.call(["resetIndex"])
 
-    # Show logs (warnings + summary)
-    if err:
-        print(color("[AppleScript log applyFile]", FG_YELLOW, BOLD))
-        # err may already contain WARNING: lines; just print as-is but dim them slightly
-        print(color(err, FG_YELLOW))
+    # Batches are cut by song line (blank lines and comments are already
+    # gone), so the numbers reported below match the songs in the TXT
+    songs = read_txt_playlist_file(txt_path)
+    batches = [songs[i:i + BATCH_SIZE] for i in range(0, len(songs), BATCH_SIZE)]
+    if not batches:
+        # Nothing to add, but still honour clear_first / create the playlist
+        batches = [[]]
 
-    if out:
-        print(color("[AppleScript output applyFile]", FG_CYAN, BOLD))
-        print(out)
+    desc_result = None
+    failed_at = None
+    for k, batch in enumerate(batches, start=1):
+        offset = (k - 1) * BATCH_SIZE
+        # Only the very first batch may clear the playlist;
+        # the description rides along with the last one
+        ok, out = _push_batch(
+            playlist_name, batch, offset, k, len(batches),
+            clear_first=clear_first and k == 1,
+            description=description if k == len(batches) else None,
+        )
+        if not ok:
+            failed_at = k
+            break
+        if description is not None and k == len(batches):
+            desc_result = out
 
-    if rc != 0:
-        print(color(f"[AppleScript error applyFile] returncode={rc}", FG_RED, BOLD))
+    if failed_at is not None:
+        print(color(
+            f"[AppleScript error applyLines] stopped at batch {failed_at}/{len(batches)}; "
+            f"songs {(failed_at - 1) * BATCH_SIZE + 1}–{len(songs)} of the TXT were not applied "
+            f"(batch {failed_at} may be partly applied).",
+            FG_RED, BOLD,
+        ))
+        print(color("Re-run the apply step (with clear first) to rebuild the playlist.", FG_YELLOW))
     else:
         print(color("✅ Done applying playlist to Apple Music.", FG_GREEN, BOLD))
 
     # Add blank line to separate next menu cleanly
     print()
 
+    if description is not None and (desc_result is None or desc_result.startswith("ERROR:")):
+        # The last batch never went through (or couldn't set it); set it on its own
+        desc_result = update_playlist_description(playlist_name, description)
+    return desc_result
+
+
+def apply_playlist_with_description(playlist_name: str, txt_path: str, description, clear_first: bool = True):
+    """
+    Apply the TXT and set the playlist description with no extra AppleScript
+    call: the description is sent along with the last batch.
+    Returns the description update result ("OK" / "ERROR: ...").
+    """
+    return apply_playlist_to_apple_music_from_txt(
+        playlist_name, txt_path, clear_first=clear_first, description=description
+    )
+
+
+def _push_batch(
+    playlist_name: str,
+    batch,
+    offset: int,
+    batch_no: int,
+    batch_count: int,
+    clear_first: bool = False,
+    description=None,
+):
+    """
+    Push one batch of TXT song lines (at most BATCH_SIZE) to the playlist,
+    optionally also setting the playlist description.
+    offset is the index of the batch's first song in the full TXT song list.
+    Returns (ok, description result or "").
+    """
+    clear_flag = "1" if clear_first else "0"
+    print(fastcolor(
+        FG_CYAN,
+        f"Pushing batch {batch_no}/{batch_count} "
+        f"(songs {offset + 1}–{offset + len(batch)})...",
+    ))
+
+    # Show logs (warnings + summary). Only the one-off osascript fallback
+    # streams them live; the persistent bridge returns them in err afterwards
+    log_started = False
+
+    def show_log(text):
+        nonlocal log_started
+        if not log_started:
+            print(fastcolor(YELLOW_BOLD, "[AppleScript log applyLines]"))
+            log_started = True
+        # text may already contain WARNING: lines; just print as-is but dim them slightly
+        print(fastcolor(FG_YELLOW, text), flush=True)
+
+    fields = [field for spec in parse_txt_playlist(batch) for field in spec]
+    if description is None:
+        args = ["applyParsed", playlist_name, clear_flag, *fields]
+    else:
+        args = ["applyParsedWithDescription", playlist_name, clear_flag, description, *fields]
+    rc, out, err = _run_music_action(args, on_log=show_log)
+    if err:
+        show_log(err)
+
+    if out and description is None:
+        print(fastcolor(CYAN_BOLD, "[AppleScript output applyLines]"))
+        print(out)
+
+    if rc != 0:
+        print(fastcolor(RED_BOLD, f"[AppleScript error applyLines] batch {batch_no} returncode={rc}"))
+        return False, ""
+    return True, out
 
-def maybe_apply_to_apple_music(playlist_name: str, txt_path: str) -> None:
+
+def ask_apply_options(playlist_name: str):
     """
-    Ask the user whether to apply the TXT playlist to Music.app now.
-    Also reminds the user about the 'Library-only' requirement.
+    Ask the user whether to apply the TXT playlist to Music.app now, and
+    whether to clear the playlist first. Also reminds the user about the
+    'Library-only' requirement.
+    Returns (apply_now, clear_first).
     """
     note = (
         "\nNOTE: This tool can only add tracks that are already in your Apple Music Library.\n"
@@ -445,13 +1347,12 @@ def maybe_apply_to_apple_music(playlist_name: str, txt_path: str) -> None:
     if ans != "y":
         print(color("  (Not applying to Music right now.)", FG_GRAY))
         print()
-        return
+        return False, False
 
     clear_choice = input(
         color("  Clear that playlist in Music before rebuilding? [Y/n]: ", FG_CYAN)
     ).strip().lower()
-    clear_first = (clear_choice != "n")
-    apply_playlist_to_apple_music_from_txt(playlist_name, txt_path, clear_first=clear_first)
+    return True, clear_choice != "n"
 
 
 def update_playlist_description(playlist_name, description):
@@ -459,28 +1360,8 @@ def update_playlist_description(playlist_name, description):
     Update the description metadata of a playlist in Apple Music.
     Only works for user-created playlists (not Smart Playlists).
     """
-    script = '''
-    on run {pName, pDesc}
-        tell application "Music"
-            try
-                set targetPlaylist to playlist pName
-                set description of targetPlaylist to pDesc
-                return "OK"
-            on error errMsg number errNum
-                return "ERROR: " & errMsg & " (" & errNum & ")"
-            end try
-        end tell
-    end run
-    '''
-
-    proc = subprocess.run(
-        ["osascript", "-", playlist_name, description],
-        input=script,
-        text=True,
-        capture_output=True,
-    )
-    result = proc.stdout.strip()
-    return result
+    _, out, _ = _run_music_action(["setDescription", playlist_name, description])
+    return out
 
 
 def get_playlist_description(playlist_name):
@@ -491,28 +1372,5 @@ def get_playlist_description(playlist_name):
       - "ERROR: ..." if something went wrong
       - the description text otherwise
     """
-    script = '''
-    on run {pName}
-        tell application "Music"
-            try
-                set targetPlaylist to playlist pName
-                set descVal to description of targetPlaylist
-                if descVal is missing value then
-                    return ""
-                else
-                    return descVal
-                end if
-            on error errMsg number errNum
-                return "ERROR: " & errMsg & " (" & errNum & ")"
-            end try
-        end tell
-    end run
-    '''
-
-    proc = subprocess.run(
-        ["osascript", "-", playlist_name],
-        input=script,
-        text=True,
-        capture_output=True,
-    )
-    return proc.stdout.strip()
+    _, out, _ = _run_music_action(["getDescription", playlist_name])
+    return out
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Direct Music.app access through PyObjC's Scripting Bridge.
+
+This talks Apple Events to Music.app straight from Python, without spawning
+osascript or compiling AppleScript. It mirrors the handlers in
+apple_music_bridge.APPLE_MUSIC_SCRIPT (same line format, same WARNING /
+SUMMARY log lines), and apple_music_bridge uses it whenever PyObjC is
+installed, keeping the AppleScript path as the fallback.
+
+Requires: pip install pyobjc-framework-ScriptingBridge
+"""
+
+import json
+import threading
+
+try:
+    from Foundation import NSAppleEventDescriptor, NSPredicate
+    from ScriptingBridge import SBApplication
+except ImportError:  # not on macOS / PyObjC not installed
+    SBApplication = None
+    NSPredicate = None
+    NSAppleEventDescriptor = None
+
+MUSIC_BUNDLE_ID = "com.apple.Music"
+
+# Music.app 'search ... only songs' enum value ('kSrS')
+_SEARCH_ONLY_SONGS = int.from_bytes(b"kSrS", "big")
+
+# 'duplicate <list> to <playlist>' Apple Event (core/clon) and its parameters
+_AE_CORE = int.from_bytes(b"core", "big")
+_AE_CLONE = int.from_bytes(b"clon", "big")
+_KEY_DIRECT_OBJECT = int.from_bytes(b"----", "big")
+_KEY_INSERT_HERE = int.from_bytes(b"insh", "big")
+_KEY_ERROR_NUMBER = int.from_bytes(b"errn", "big")
+_AE_WAIT_REPLY = 0x00000003
+_AE_AUTO_RETURN_ID = -1
+_AE_ANY_TRANSACTION = 0
+_AE_TIMEOUT_SECONDS = 600.0
+
+# Resolved tracks are duplicated this many per Apple Event (as in flushResolvedTracks)
+DUPLICATE_CHUNK_SIZE = 500
+
+
+def available() -> bool:
+    """True if PyObjC's Scripting Bridge can be used on this machine."""
+    return SBApplication is not None
+
+
+def _batch_property(items, prop):
+    """
+    Casefolded text of one property for every item. SBElementArray can fetch it
+    for all items in a single Apple Event; plain arrays fall back to per item.
+    """
+    if hasattr(items, "arrayByApplyingSelector_"):
+        values = items.arrayByApplyingSelector_(prop)
+    else:
+        values = [getattr(item, prop)() for item in items]
+    return [str(v).casefold() if v is not None else "" for v in values]
+
+
+def _duplicate_tracks(tracks, playlist):
+    """
+    'duplicate {t1, t2, ...} to playlist' as one Apple Event, in list order.
+    Scripting Bridge only offers duplicateTo: per object, so the event is
+    built from each object's specifier. Raises on any failure.
+    """
+    items = NSAppleEventDescriptor.listDescriptor()
+    for i, track in enumerate(tracks, start=1):
+        items.insertDescriptor_atIndex_(track.qualifiedSpecifier(), i)
+
+    event = NSAppleEventDescriptor.appleEventWithEventClass_eventID_targetDescriptor_returnID_transactionID_(
+        _AE_CORE,
+        _AE_CLONE,
+        NSAppleEventDescriptor.descriptorWithBundleIdentifier_(MUSIC_BUNDLE_ID),
+        _AE_AUTO_RETURN_ID,
+        _AE_ANY_TRANSACTION,
+    )
+    event.setParamDescriptor_forKeyword_(items, _KEY_DIRECT_OBJECT)
+    event.setParamDescriptor_forKeyword_(playlist.qualifiedSpecifier(), _KEY_INSERT_HERE)
+
+    reply, error = event.sendEventWithOptions_timeout_error_(
+        _AE_WAIT_REPLY, _AE_TIMEOUT_SECONDS, None
+    )
+    if reply is None:
+        raise RuntimeError(str(error))
+    errn = reply.paramDescriptorForKeyword_(_KEY_ERROR_NUMBER)
+    if errn is not None and errn.int32Value() != 0:
+        raise RuntimeError(f"Apple Event error {errn.int32Value()}")
+
+
+def _strip_bracket_suffix(title):
+    """'Intro (feat. X)' -> 'Intro'; unchanged if there is no ' (' / ' [' suffix."""
+    cuts = [pos for pos in (title.find(" ("), title.find(" [")) if pos > 0]
+    return title[:min(cuts)] if cuts else title
+
+
+class MusicBridge:
+    """
+    One Scripting Bridge connection to Music.app plus the per-run
+    counters / log lines that the AppleScript version keeps in properties.
+    """
+
+    def __init__(self):
+        self.music = SBApplication.applicationWithBundleIdentifier_(MUSIC_BUNDLE_ID)
+        if self.music is None:
+            raise RuntimeError("Music.app not found")
+        self._reset_stats()
+        self.reset_pid_index()
+
+    # ---------- bookkeeping ----------
+
+    def _reset_stats(self):
+        self.pid_success = 0
+        self.pid_fail = 0
+        self.search_success = 0
+        self.search_fail = 0
+        self.skipped_lines = 0
+        self.log_lines = []
+        # (track, "pid" / "search") queued by add_track_to_playlist, in order
+        self._resolved = []
+
+    def _log(self, msg):
+        self.log_lines.append(msg)
+
+    def _summary(self):
+        self._log(
+            f"SUMMARY: PID success={self.pid_success}, PID fail={self.pid_fail}, "
+            f"Search success={self.search_success}, Search fail={self.search_fail}, "
+            f"Skipped lines={self.skipped_lines}"
+        )
+
+    # ---------- playlists ----------
+
+    def _find_user_playlist(self, playlist_name):
+        matches = self.music.userPlaylists().filteredArrayUsingPredicate_(
+            NSPredicate.predicateWithFormat_("name == %@", playlist_name)
+        )
+        if matches.count() > 0:
+            return matches.objectAtIndex_(0)
+        return None
+
+    def ensure_playlist_named(self, playlist_name):
+        """Return the user playlist with this name, creating it if needed."""
+        playlist = self._find_user_playlist(playlist_name)
+        if playlist is not None:
+            return playlist
+        cls = self.music.classForScriptingClass_("user playlist")
+        playlist = cls.alloc().initWithProperties_({"name": playlist_name})
+        self.music.userPlaylists().addObject_(playlist)
+        return playlist
+
+    def clear_playlist(self, playlist_name):
+        playlist = self.ensure_playlist_named(playlist_name)
+        try:
+            playlist.tracks().removeAllObjects()
+        except Exception as e:
+            self._log(f"WARNING: Error clearing playlist '{playlist_name}': {e}")
+        return playlist
+
+    # ---------- tracks ----------
+
+    def _library(self):
+        return self.music.libraryPlaylists().objectAtIndex_(0)
+
+    def reset_pid_index(self):
+        """Forget the PID index so the next lookup re-reads the library."""
+        self._pid_tracks = None
+        self._pid_index = None
+        self._pid_misses = set()
+
+    def _build_pid_index(self):
+        # One Apple Event for every persistent ID; track objects stay lazy
+        tracks = self._library().tracks()
+        pids = tracks.arrayByApplyingSelector_("persistentID")
+        self._pid_tracks = tracks
+        # Hex case differs between exports and TXT edits, so key on upper case
+        self._pid_index = {str(pid).upper(): i for i, pid in enumerate(pids)}
+
+    def find_track_by_pid(self, pid):
+        pid = pid.upper()
+        if pid in self._pid_misses:
+            self.pid_fail += 1
+            self._log(f"WARNING: PID not found in library: {pid}")
+            return None
+        try:
+            if self._pid_index is None:
+                self._build_pid_index()
+            i = self._pid_index.get(pid)
+            if i is None:
+                self.pid_fail += 1
+                self._pid_misses.add(pid)
+                self._log(f"WARNING: PID not found in library: {pid}")
+                return None
+            self.pid_success += 1
+            return self._pid_tracks.objectAtIndex_(i)
+        except Exception as e:
+            self.pid_fail += 1
+            self._log(f"WARNING: Error in findTrackByPID for PID {pid}: {e}")
+            return None
+
+    def add_track_to_playlist(self, track, kind="pid"):
+        """Queue a resolved track; flush_resolved_tracks adds them in bulk."""
+        self._resolved.append((track, kind))
+
+    def flush_resolved_tracks(self, playlist, playlist_name):
+        """
+        Duplicate the queued tracks to the playlist, DUPLICATE_CHUNK_SIZE per
+        Apple Event, keeping their order.
+        """
+        resolved, self._resolved = self._resolved, []
+        for a in range(0, len(resolved), DUPLICATE_CHUNK_SIZE):
+            chunk = resolved[a:a + DUPLICATE_CHUNK_SIZE]
+            count_before = playlist.tracks().count()
+            try:
+                _duplicate_tracks([track for track, _ in chunk], playlist)
+                continue
+            except Exception as e:
+                if playlist.tracks().count() != count_before:
+                    # Part of the chunk went in; retrying would add duplicates
+                    self._log(
+                        f"WARNING: Error duplicating tracks {a + 1}-{a + len(chunk)} "
+                        f"to playlist '{playlist_name}': {e}"
+                    )
+                    continue
+
+            # Nothing was added: go one by one so a bad track only loses itself
+            for track, kind in chunk:
+                try:
+                    track.duplicateTo_(playlist)
+                except Exception as e:
+                    if kind == "search":
+                        self.search_success -= 1
+                        self.search_fail += 1
+                        self._log(
+                            f"WARNING: Error duplicating search result to playlist '{playlist_name}': {e}"
+                        )
+                    else:
+                        self._log(f"WARNING: Error duplicating track to playlist '{playlist_name}': {e}")
+
+    def search_and_add_title_artist(self, line_text, playlist, playlist_name):
+        title, artist = line_text, ""
+        for sep in (" – ", " - "):
+            parts = line_text.split(sep)
+            if len(parts) > 1:
+                title, artist = parts[0], parts[1]
+                break
+        self.search_and_add_parts(title.strip(), artist.strip(), playlist, playlist_name)
+
+    def _search_best_match(self, query, title, artist):
+        """
+        Run one library search for query and pick the best result.
+        Returns (number of search results, chosen track or None).
+        """
+        results = self._library().searchFor_only_(query, _SEARCH_ONLY_SONGS)
+        if not results:
+            return 0, None
+
+        # Fetch every candidate's name and artist in one Apple Event per property
+        names = _batch_property(results, "name")
+        artists = _batch_property(results, "artist")
+
+        title_cf = title.casefold()
+        artist_cf = artist.casefold()
+
+        # One pass: title AND artist match wins; else the first title-only match
+        fallback = None
+        for i, name in enumerate(names):
+            if name and title_cf in name:
+                if not artist_cf or artist_cf in artists[i]:
+                    return len(names), results[i]
+                if fallback is None:
+                    fallback = results[i]
+
+        return len(names), fallback
+
+    def search_and_add_parts(self, title, artist, playlist, playlist_name):
+        hits = 0
+        chosen = None
+
+        # 1) "title artist" as one query: Music matches both, so far fewer results
+        if artist:
+            hits, chosen = self._search_best_match(f"{title} {artist}", title, artist)
+
+        # 2) title only
+        if chosen is None:
+            n, chosen = self._search_best_match(title, title, artist)
+            hits += n
+
+        # 3) title without a bracketed suffix such as " (feat. X)"
+        if chosen is None:
+            short_title = _strip_bracket_suffix(title)
+            if short_title != title:
+                n, chosen = self._search_best_match(short_title, short_title, artist)
+                hits += n
+
+        if chosen is None:
+            self.search_fail += 1
+            if hits:
+                self._log(f"WARNING: No suitable match for title '{title}' (artist hint: '{artist}')")
+            else:
+                self._log(f"WARNING: No search results for title '{title}' (artist hint: '{artist}')")
+            return
+
+        self.search_success += 1
+        self.add_track_to_playlist(chosen, "search")
+
+    def add_line_to_playlist(self, line_text, playlist, playlist_name):
+        line_text = line_text.strip()
+        if not line_text or line_text.startswith("#"):
+            self.skipped_lines += 1
+            return
+
+        # 1) PID prefix: [pid=...] (any case, like AppleScript's "starts with")
+        if line_text[:5].lower() == "[pid=":
+            closing = line_text.find("]")
+            if closing > 5:
+                pid = line_text[5:closing]
+                core_label = line_text[closing + 2:]
+
+                track = self.find_track_by_pid(pid)
+                if track is not None:
+                    self.add_track_to_playlist(track)
+                    return
+
+                # PID lookup failed; fall back to the label (if any)
+                if not core_label:
+                    self.skipped_lines += 1
+                    return
+                line_text = core_label
+            else:
+                self._log(f"WARNING: Malformed PID prefix in line: {line_text}")
+
+        # 2) [url=...] prefix is metadata only
+        if line_text[:5].lower() == "[url=":
+            closing = line_text.find("]")
+            if closing > 5:
+                line_text = line_text[closing + 2:]
+                if not line_text:
+                    self.skipped_lines += 1
+                    return
+
+        # 3) Bare URL-only lines are not supported
+        if "://" in line_text:
+            self._log(
+                "WARNING: URL-only line not supported. Please add this track to your "
+                "Library and use a Title – Artist or PID label instead: " + line_text
+            )
+            self.skipped_lines += 1
+            return
+
+        # 4) Title – Artist fallback
+        self.search_and_add_title_artist(line_text, playlist, playlist_name)
+
+    def add_spec_to_playlist(self, kind, pid, title, artist, playlist, playlist_name):
+        """Handle one record pre-parsed by apple_music_bridge.parse_txt_line."""
+        if kind == "pid":
+            track = self.find_track_by_pid(pid)
+            if track is not None:
+                self.add_track_to_playlist(track)
+            elif title:
+                self.search_and_add_parts(title, artist, playlist, playlist_name)
+            else:
+                self.skipped_lines += 1
+        elif kind == "pidwarn":
+            track = self.find_track_by_pid(pid)
+            if track is not None:
+                self.add_track_to_playlist(track)
+            else:
+                self._log(title)
+                self.skipped_lines += 1
+        elif kind == "label":
+            self.search_and_add_parts(title, artist, playlist, playlist_name)
+        elif kind == "skip":
+            if title:
+                self._log(title)
+            self.skipped_lines += 1
+        elif kind == "note":
+            self._log(title)
+
+    def apply_specs(self, fields, playlist_name, clear_first):
+        """fields is the flat kind, pid, title, artist, ... list sent by applyParsed."""
+        self._reset_stats()
+        if clear_first:
+            playlist = self.clear_playlist(playlist_name)
+        else:
+            playlist = self.ensure_playlist_named(playlist_name)
+
+        for k in range(0, len(fields) - 3, 4):
+            self.add_spec_to_playlist(*fields[k:k + 4], playlist, playlist_name)
+        self.flush_resolved_tracks(playlist, playlist_name)
+
+        self._summary()
+        return playlist
+
+    def apply_lines(self, lines, playlist_name, clear_first):
+        self._reset_stats()
+        if clear_first:
+            playlist = self.clear_playlist(playlist_name)
+        else:
+            playlist = self.ensure_playlist_named(playlist_name)
+
+        for line in lines:
+            self.add_line_to_playlist(line, playlist, playlist_name)
+        self.flush_resolved_tracks(playlist, playlist_name)
+
+        self._summary()
+
+    # ---------- descriptions ----------
+
+    def get_description(self, playlist_name):
+        playlist = self.music.playlists().objectWithName_(playlist_name)
+        if not playlist.exists():
+            return "ERROR: Can't get playlist " + repr(playlist_name)
+        return playlist.objectDescription() or ""
+
+    def set_description(self, playlist_name, description):
+        playlist = self.music.playlists().objectWithName_(playlist_name)
+        if not playlist.exists():
+            return "ERROR: Can't get playlist " + repr(playlist_name)
+        playlist.setObjectDescription_(description)
+        return "OK"
+
+
+_BRIDGE = None
+# dispatch() can be called from worker threads (e.g. the description prefetch)
+# while the main thread applies a playlist; the shared MusicBridge keeps
+# per-run state (log lines, queued tracks), so one action runs at a time.
+_BRIDGE_LOCK = threading.Lock()
+
+
+def _bridge():
+    """The shared MusicBridge; call with _BRIDGE_LOCK held."""
+    global _BRIDGE
+    if _BRIDGE is None:
+        _BRIDGE = MusicBridge()
+    return _BRIDGE
+
+
+def reset_pid_index():
+    """Drop the shared MusicBridge's PID index, if one has been built."""
+    with _BRIDGE_LOCK:
+        if _BRIDGE is not None:
+            _BRIDGE.reset_pid_index()
+
+
+def dispatch(args):
+    """
+    Run one APPLE_MUSIC_SCRIPT-style action (same argv layout as its dispatch()).
+    Returns (returncode, stdout, stderr) like apple_music_bridge._run_osascript,
+    or None if Scripting Bridge can't handle it (caller falls back to AppleScript).
+    """
+    if not available() or not args:
+        return None
+    with _BRIDGE_LOCK:
+        try:
+            bridge = _bridge()
+        except RuntimeError:
+            return None
+        return _dispatch(bridge, args)
+
+
+def _dispatch(bridge, args):
+    action, rest = args[0], list(args[1:])
+    bridge.log_lines = []
+    # Drop anything left queued by a run that raised before its flush
+    bridge._resolved = []
+
+    if action in ("getDescription", "setDescription"):
+        try:
+            if action == "getDescription":
+                out = bridge.get_description(rest[0])
+            else:
+                out = bridge.set_description(rest[0], rest[1])
+        except AttributeError:
+            # Property not exposed under this name on this macOS; use AppleScript
+            return None
+        except Exception as e:
+            out = f"ERROR: {e}"
+        return 0, out, ""
+
+    try:
+        if action == "applyParsedWithDescription" and len(rest) >= 3:
+            playlist = bridge.apply_specs(rest[3:], rest[0], rest[1] == "1")
+            try:
+                playlist.setObjectDescription_(rest[2])
+                out = "OK"
+            except Exception as e:
+                # Caller falls back to a separate setDescription
+                out = f"ERROR: {e}"
+            return 0, out, "\n".join(bridge.log_lines)
+        elif action == "applyParsed" and len(rest) >= 2:
+            bridge.apply_specs(rest[2:], rest[0], rest[1] == "1")
+        elif action == "addLinesJSON" and len(rest) >= 2:
+            bridge.apply_lines(json.loads(rest[0]), rest[1], False)
+        elif action == "applyFile" and len(rest) >= 3:
+            with open(rest[0], "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            bridge.reset_pid_index()
+            bridge.apply_lines(lines, rest[1], rest[2] == "1")
+        elif action == "addLine" and len(rest) >= 2:
+            playlist = bridge.ensure_playlist_named(rest[1])
+            bridge.add_line_to_playlist(rest[0], playlist, rest[1])
+            bridge.flush_resolved_tracks(playlist, rest[1])
+        elif action == "resetIndex":
+            bridge.reset_pid_index()
+        elif action == "clear" and len(rest) >= 1:
+            bridge.clear_playlist(rest[0])
+        else:
+            return None
+    except Exception as e:
+        return 1, "", "\n".join(bridge.log_lines + [f"ERROR: {e}"])
+
+    return 0, "", "\n".join(bridge.log_lines)
@@ -18,6 +18,20 @@ FG_WHITE = "\033[37m"
 FG_GRAY = "\033[90m"
 
 
+# Common color + effect combinations, ready to pass to fastcolor()
+RED_BOLD = FG_RED + BOLD
+YELLOW_BOLD = FG_YELLOW + BOLD
+CYAN_BOLD = FG_CYAN + BOLD
+
+
+def fastcolor(prefix: str, text: str) -> str:
+    """
+    Like color() with the effect codes already combined into one prefix
+    (e.g. CYAN_BOLD), for loops that color many lines.
+    """
+    return prefix + text + RESET
+
+
 def color(text: str, *effects: str) -> str:
     """
     Wrap text in one or more color/effect codes.
@@ -25,4 +39,6 @@ def color(text: str, *effects: str) -> str:
     Example:
         print(color("Hello", FG_GREEN, BOLD))
     """
+    if len(effects) == 1:
+        return effects[0] + text + RESET
     return "".join(effects) + text + RESET
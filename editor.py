@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
+import sys
+
 import questionary
 
 from pid_utils import (
-    extract_pid,
+    split_label,
     display_label,
     get_label_with_optional_pid,
     attach_pid_to_existing_label,
@@ -10,20 +12,24 @@ from pid_utils import (
 
 
 def show_song_counts(counter):
-    print("\nCurrent songs in playlist:")
+    # Build the whole listing and write it at once instead of print() per song
+    lines = ["", "Current songs in playlist:"]
     if not counter:
-        print("(no songs)")
-        print()
-        return
-
+        lines.append("(no songs)")
     for idx, (song, cnt) in enumerate(counter.items(), start=1):
-        label = display_label(song)
-        pid = extract_pid(song)
+        label, pid = split_label(song)
         if pid:
-            print(f"[{idx}] {label} -> {cnt} (PID: {pid})")
+            lines.append(f"[{idx}] {label} -> {cnt} (PID: {pid})")
         else:
-            print(f"[{idx}] {label} -> {cnt}")
-    print()
+            lines.append(f"[{idx}] {label} -> {cnt}")
+    lines.append("\n")
+    sys.stdout.write("\n".join(lines))
+
+
+# (title, value) pairs from the last choose_song_from_counter call, keyed by
+# the counter's (song, count) items, so menus over an unchanged counter skip
+# re-labelling. Each prompt still gets its own Choice objects.
+_choices_cache = ((), [])
 
 
 def choose_song_from_counter(counter, prompt="Select a song:"):
@@ -31,19 +37,21 @@ def choose_song_from_counter(counter, prompt="Select a song:"):
     Use an arrow-key menu to select a song from the Counter.
     Returns the song label (key in the Counter), or None if cancelled.
     """
-    items = list(counter.items())
+    global _choices_cache
+
+    items = tuple(counter.items())
     if not items:
         print("No songs available.")
         return None
 
-    choices = []
-    for song, cnt in items:
-        title = f"{display_label(song)}  (x{cnt})"
-        choices.append(questionary.Choice(title=title, value=song))
+    cached_items, titled = _choices_cache
+    if items != cached_items:
+        titled = [(f"{split_label(song)[0]}  (x{cnt})", song) for song, cnt in items]
+        _choices_cache = (items, titled)
 
     selected = questionary.select(
         prompt,
-        choices=choices,
+        choices=[questionary.Choice(title=title, value=song) for title, song in titled],
         qmark="🎵",
     ).ask()
 
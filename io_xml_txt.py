@@ -1,129 +1,464 @@
 #!/usr/bin/env python3
+import hashlib
+import mmap
 import os
-import plistlib
-from datetime import datetime
+import pickle
+import shutil
+import sys
+import time
+import xml.etree.ElementTree as ET
+from array import array
+from collections import Counter
 
-from pid_utils import build_song_label, get_label_with_optional_pid
+from pid_utils import URL_PREFIX_B, build_song_label, get_label_with_optional_pid
+
+try:
+    from lxml import etree as lxml_etree  # optional: C-backed iterparse
+except ImportError:
+    lxml_etree = None
 
 
 # ---------- Filename & TXT helpers ----------
 
+# Characters not allowed in file names (Windows is the strictest)
+_BAD_FILENAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', "_"))
+
+# Byte markers of a line that *might* carry a URL; confirmed by _is_url_line
+_URL_HINTS = (b"://", URL_PREFIX_B)
+
+
+# Buffer size for writing TXT playlists
+WRITE_BUFFER_SIZE = 1 << 20
+
+# TXT playlists larger than this are scanned through mmap
+TXT_MMAP_THRESHOLD = 64 << 10
+
+
 def sanitize_filename(name: str) -> str:
-    bad_chars = '<>:"/\\|?*'
-    for ch in bad_chars:
-        name = name.replace(ch, "_")
-    return name.strip()
+    return name.translate(_BAD_FILENAME_TABLE).strip()
 
 
 def write_playlist_file(playlist_name, ordered_songs, output_path=None, note="Generated"):
+    """
+    Write a TXT playlist. ordered_songs may be any iterable of song labels.
+    Returns the path written.
+    """
     if output_path is None:
         filename = sanitize_filename(playlist_name) + ".txt"
         output_path = os.path.abspath(filename)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(f"# Playlist: {playlist_name}\n")
-        f.write(f"# {note} by apple-music-pl-generator.py\n")
-        f.write(f"# Timestamp: {datetime.now().isoformat(timespec='seconds')}\n\n")
-        for song in ordered_songs:
-            f.write(song + "\n")
+    # Build the whole file in memory instead of writing it song by song
+    header = (
+        f"# Playlist: {playlist_name}\n"
+        f"# {note} by apple-music-pl-generator.py\n"
+        f"# Timestamp: {time.strftime('%Y-%m-%dT%H:%M:%S')}\n\n"
+    )
+    body = "\n".join(ordered_songs)
+    if body:
+        body += "\n"
+
+    with open(output_path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        # Header and body go out separately so a large body isn't copied
+        # again just to prepend a few header lines
+        f.writelines((header.encode("utf-8"), body.encode("utf-8")))
 
     print(f"\n✅ Playlist file written to: {output_path}")
     return output_path
 
 
-def read_txt_playlist_file(path):
-    songs = []
+def _open_txt_mmap(f):
+    """mmap of an open TXT file if it's big enough to be worth it, else None."""
+    if os.fstat(f.fileno()).st_size <= TXT_MMAP_THRESHOLD:
+        return None
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def iter_txt_playlist_file(path):
+    """
+    Yield the song lines of a TXT playlist one at a time
+    (blank lines and '#' comments are skipped).
+    Large files are read from an mmap and only song lines get decoded.
+    """
+    with open(path, "rb") as f:
+        mm = _open_txt_mmap(f)
+        if mm is not None:
+            with mm:
+                for chunk in iter(mm.readline, b""):
+                    # readline only splits on \n; split CR / CRLF endings too,
+                    # like the text-mode path's universal newlines
+                    for raw in chunk.splitlines() if b"\r" in chunk else (chunk,):
+                        head = raw.lstrip()
+                        if not head or head.startswith(b"#"):
+                            continue
+                        line = raw.decode("utf-8").strip()
+                        if not line or line.startswith("#"):
+                            continue
+                        yield line
+            return
+
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
-            songs.append(line)
-    return songs
+            yield line
+
+
+def read_txt_playlist_file(path):
+    return list(iter_txt_playlist_file(path))
 
 
 # ---------- XML parsing (Apple Music / iTunes playlist export) ----------
 
-def parse_xml_playlist(path):
+def _plist_dict_fields(elem):
     """
-    Parse an Apple Music / iTunes XML playlist export.
-    Returns: (playlist_name, [song_label, ...])
-    Each song_label is:
-      - '[pid=HEX] Title – Artist' if a Persistent ID is available
-      - 'Title – Artist' otherwise
+    Map each <key> of a plist <dict> element to its value element.
     """
-    with open(path, "rb") as f:
-        data = plistlib.load(f)
+    fields = {}
+    children = iter(elem)
+    for key in children:
+        value = next(children, None)
+        if key.tag == "key" and value is not None:
+            fields[key.text or ""] = value
+    return fields
 
-    tracks_dict = data.get("Tracks", {})
-    playlists = data.get("Playlists", [])
 
-    if not playlists:
-        raise ValueError("No playlists found in XML file.")
+def _plist_text(fields, key, default=None):
+    value = fields.get(key)
+    if value is None:
+        return default
+    return value.text or ""
+
 
+def _choose_playlist(playlists, interactive=True):
+    """
+    playlists: list of (name, [track_id, ...])
+    Returns the chosen entry, prompting if there is more than one.
+    With interactive=False, more than one playlist is an error instead.
+    """
     if len(playlists) == 1:
-        chosen = playlists[0]
-    else:
-        print("\nMultiple playlists found in this XML:")
-        for idx, pl in enumerate(playlists, start=1):
-            print(f"[{idx}] {pl.get('Name', 'Unnamed Playlist')}")
-        while True:
+        return playlists[0]
+
+    if not interactive:
+        raise ValueError(
+            f"Multiple playlists found in XML ({len(playlists)}); "
+            "sync this file on its own to choose one."
+        )
+
+    print("\nMultiple playlists found in this XML:")
+    for idx, (name, _) in enumerate(playlists, start=1):
+        print(f"[{idx}] {name}")
+    while True:
+        try:
+            choice = int(input("Choose a playlist index: ").strip())
+            if 1 <= choice <= len(playlists):
+                return playlists[choice - 1]
+            else:
+                print("Invalid index.")
+        except ValueError:
+            print("Please enter a valid integer.")
+
+
+# Exports larger than this are read through mmap instead of buffered reads
+MMAP_THRESHOLD = 4 << 20
+
+
+def _iterparse(path, events):
+    """
+    iterparse from lxml when it's installed (faster, less allocation),
+    otherwise ElementTree's. Both yield the same (event, element) stream.
+    Large files are fed to the parser from an mmap of the file.
+    """
+    with open(path, "rb") as f:
+        source = f
+        mm = None
+        if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
             try:
-                choice = int(input("Choose a playlist index: ").strip())
-                if 1 <= choice <= len(playlists):
-                    chosen = playlists[choice - 1]
-                    break
-                else:
-                    print("Invalid index.")
-            except ValueError:
-                print("Please enter a valid integer.")
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                source = mm
+            except (OSError, ValueError):
+                pass
+        try:
+            if lxml_etree is not None:
+                # huge_tree: exports can hold very large text nodes (e.g. artwork data)
+                yield from lxml_etree.iterparse(source, events=events, huge_tree=True)
+            else:
+                yield from ET.iterparse(source, events=events)
+        finally:
+            if mm is not None:
+                mm.close()
+
+
+def _load_xml_library(path, want_playlists=True, track_ids_wanted=None):
+    """
+    Stream an Apple Music / iTunes XML export with iterparse.
+    Returns (labels, playlists):
+      - labels: {Track ID (text): song_label}
+      - playlists: [(name, [Track ID (text), ...]), ...]
+
+    Every track / playlist <dict> is dropped as soon as it has been handled,
+    so only one label per track (plus the playlists' Track IDs) stays in memory.
 
-    playlist_name = chosen.get("Name", "Unnamed Playlist")
-    items = chosen.get("Playlist Items", [])
+    track_ids_wanted: if given, only label these tracks (empty set: none).
+    want_playlists=False stops reading once the Tracks section is done.
+    """
+    labels = {}
+    playlists = []
+    want_tracks = track_ids_wanted is None or bool(track_ids_wanted)
+
+    stack = []
+    section = None
+    for event, elem in _iterparse(path, ("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
 
-    ordered_songs = []
+        stack.pop()
+        depth = len(stack)
 
-    for item in items:
-        track_id = item.get("Track ID")
-        if track_id is None:
+        if depth == 2:
+            # Direct child of the top-level <dict>: remember which section we're in
+            if elem.tag == "key":
+                if section == "Tracks" and not want_playlists:
+                    break
+                section = elem.text
+            elem.clear()
             continue
 
-        track = tracks_dict.get(str(track_id)) or tracks_dict.get(track_id)
-        if not track:
+        if depth != 3 or section not in ("Tracks", "Playlists"):
             continue
 
-        name = track.get("Name", "Unknown Title")
-        artist = track.get("Artist")
-        pid = track.get("Persistent ID")
+        if elem.tag == "dict":
+            if section == "Tracks":
+                if want_tracks:
+                    fields = _plist_dict_fields(elem)
+                    track_id = _plist_text(fields, "Track ID")
+                    if track_id and (track_ids_wanted is None or track_id in track_ids_wanted):
+                        name = _plist_text(fields, "Name", "Unknown Title")
+                        artist = _plist_text(fields, "Artist")
+                        pid = _plist_text(fields, "Persistent ID")
+
+                        if artist:
+                            core_label = f"{name} – {artist}"
+                        else:
+                            core_label = name
+
+                        # Interned so tracks sharing a label share one string
+                        if pid:
+                            labels[track_id] = sys.intern(build_song_label(core_label, pid))
+                        else:
+                            labels[track_id] = sys.intern(core_label)
+            elif want_playlists:
+                fields = _plist_dict_fields(elem)
+                items = fields.get("Playlist Items")
+                track_ids = []
+                if items is not None:
+                    append = track_ids.append
+                    for item in items:
+                        # Items are normally just <key>Track ID</key><integer>..</integer>;
+                        # read that pair directly instead of building a field map
+                        if len(item) == 2 and item[0].text == "Track ID":
+                            track_id = item[1].text
+                        else:
+                            track_id = _plist_text(_plist_dict_fields(item), "Track ID")
+                        if track_id:
+                            append(track_id)
+                playlists.append(
+                    (_plist_text(fields, "Name", "Unnamed Playlist"), track_ids)
+                )
+
+        # Finished with this <key>/<dict>; detach it from the section container
+        del stack[-1][-1]
+
+    return labels, playlists
+
+
+# ---------- On-disk cache for parsed XML exports ----------
+
+XML_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "apple-music-pl-generator")
+
+
+# Bump whenever the cached (labels, playlists) layout or the label format
+# (build_song_label) changes, so older caches are ignored
+XML_CACHE_VERSION = 2
+
+
+def _xml_cache_path(path):
+    """
+    Cache file for an XML export: "<path key>-<revision key>.pkl". The path
+    key is the same for every revision of one export; the revision key covers
+    XML_CACHE_VERSION, mtime_ns and size, so any change invalidates it.
+    """
+    st = os.stat(path)
+    path_key = hashlib.blake2b(
+        os.path.abspath(path).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    rev_key = hashlib.blake2b(
+        f"{XML_CACHE_VERSION}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8"), digest_size=8
+    ).hexdigest()
+    return os.path.join(XML_CACHE_DIR, f"{path_key}-{rev_key}.pkl")
 
-        if artist:
-            core_label = f"{name} – {artist}"
-        else:
-            core_label = name
 
-        if pid:
-            label = build_song_label(core_label, pid)
-        else:
-            label = core_label
+def _remove_stale_xml_caches(cache_path):
+    """
+    Delete the other cache files of the same export (older revisions), plus
+    any left in the old single-hash naming, which is never read any more.
+    """
+    keep = os.path.basename(cache_path)
+    prefix = keep.split("-", 1)[0] + "-"
+    try:
+        names = os.listdir(XML_CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        if name == keep or not name.endswith(".pkl"):
+            continue
+        if name.startswith(prefix) or "-" not in name:
+            try:
+                os.remove(os.path.join(XML_CACHE_DIR, name))
+            except OSError:
+                pass
 
-        ordered_songs.append(label)
 
-    if not ordered_songs:
+def _cached_load_xml_library(path, use_cache=True):
+    """
+    _load_xml_library with a pickle cache under XML_CACHE_DIR.
+    Cache problems are never fatal; we just fall back to parsing.
+    """
+    if not use_cache:
+        return _load_xml_library(path)
+
+    cache_path = _xml_cache_path(path)
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing, truncated or foreign pickle (unpickling can raise nearly
+        # anything): re-parse and overwrite it below
+        pass
+
+    labels, playlists = _load_xml_library(path)
+
+    try:
+        os.makedirs(XML_CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((labels, playlists), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    else:
+        _remove_stale_xml_caches(cache_path)
+
+    return labels, playlists
+
+
+def clear_xml_cache() -> int:
+    """
+    Delete every cached XML parse. Returns the number of files removed.
+    """
+    removed = 0
+    try:
+        names = os.listdir(XML_CACHE_DIR)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        if name.endswith(".pkl"):
+            try:
+                os.remove(os.path.join(XML_CACHE_DIR, name))
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+def _select_xml_playlist(path, use_cache=True, interactive=True):
+    """
+    Load (or fetch from cache) an XML export and let the user pick a playlist.
+    Returns (playlist_name, labels, track_ids).
+
+    With use_cache=False, nothing is kept for other playlists, so the export
+    is read twice instead: first only the playlists, then only the tracks the
+    chosen one uses. Memory then grows with the playlist, not the library.
+    """
+    if use_cache:
+        labels, playlists = _cached_load_xml_library(path)
+    else:
+        _, playlists = _load_xml_library(path, track_ids_wanted=set())
+
+    if not playlists:
+        raise ValueError("No playlists found in XML file.")
+
+    playlist_name, track_ids = _choose_playlist(playlists, interactive=interactive)
+    if not use_cache:
+        labels, _ = _load_xml_library(
+            path, want_playlists=False, track_ids_wanted=set(track_ids)
+        )
+    return playlist_name, labels, track_ids
+
+
+def count_xml_playlist(path, use_cache=True):
+    """
+    Parse an Apple Music / iTunes XML playlist export for callers that only
+    need per-song counts. Each song_label is:
+      - '[pid=HEX] Title – Artist' if a Persistent ID is available
+      - 'Title – Artist' otherwise
+    Returns: (playlist_name, Counter({song_label: count}))
+    The ordered song list is never built.
+    """
+    playlist_name, labels, track_ids = _select_xml_playlist(path, use_cache=use_cache)
+
+    counter = Counter()
+    counter.update(label for label in map(labels.get, track_ids) if label)
+
+    if not counter:
         raise ValueError("No playlist items found in XML.")
 
-    return playlist_name, ordered_songs
+    return playlist_name, counter
+
+
+def index_xml_playlist(path, use_cache=True, interactive=True):
+    """
+    Parse an Apple Music / iTunes XML playlist export, keeping its order in
+    a compact form suited to long playlists.
+    Returns: (playlist_name, unique_songs, order)
+      - unique_songs: list of distinct song labels
+      - order: array('i') of indexes into unique_songs, in playlist order
+    The full sequence is map(unique_songs.__getitem__, order).
+
+    The parsed export is cached on disk (see _cached_load_xml_library), so
+    re-running against an unchanged XML skips parsing entirely.
+    With interactive=False, an export holding several playlists raises
+    ValueError instead of prompting (for batch / background use).
+    """
+    playlist_name, labels, track_ids = _select_xml_playlist(
+        path, use_cache=use_cache, interactive=interactive
+    )
+
+    index = {}
+    order = array("i")
+    for label in map(labels.get, track_ids):
+        if label:
+            order.append(index.setdefault(label, len(index)))
+
+    if not order:
+        raise ValueError("No playlist items found in XML.")
+
+    return playlist_name, list(index), order
 
 
 # ---------- URL cleanup integrated helper ----------
 
 def _backup_file(path: str) -> str:
     dir_name, base = os.path.split(path)
-    ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+    ts = time.strftime("%Y%m%d-%H%M%S")
     backup_name = f"{base}.bak-{ts}"
     backup_path = os.path.join(dir_name, backup_name)
-    with open(path, "r", encoding="utf-8") as src, open(backup_path, "w", encoding="utf-8") as dst:
-        for line in src:
-            dst.write(line)
+    # Byte-for-byte copy; copyfile uses the OS fast path (fcopyfile / sendfile)
+    shutil.copyfile(path, backup_path)
     return backup_path
 
 
@@ -199,51 +534,64 @@ def _process_url_line_interactive(raw: str) -> str:
     return line
 
 
-def fix_playlist_urls(txt_path: str) -> None:
+def _is_url_line(line: str) -> bool:
+    stripped = line.lstrip()
+    return stripped.startswith("[url=") or ("://" in stripped and not stripped.startswith("#"))
+
+
+def _has_url_hint(buf) -> bool:
+    """Substring scan for URL markers; works on bytes and mmap objects."""
+    return any(buf.find(hint) != -1 for hint in _URL_HINTS)
+
+
+def _is_url_line_bytes(raw: bytes) -> bool:
+    """_is_url_line for a raw UTF-8 line; only lines with a URL marker get decoded."""
+    if not _has_url_hint(raw):
+        return False
+    return _is_url_line(raw.decode("utf-8"))
+
+
+def fix_playlist_urls_bytes(data: bytes, source: str = "TXT") -> bytes:
     """
-    Scan txt_path for any URL-based lines and fix them interactively.
+    Scan TXT playlist contents for URL-based lines and fix them interactively:
 
     - [url=...] Label -> canonical label via get_label_with_optional_pid(Label)
     - bare URL lines  -> prompt for Title – Artist, then PID helper
 
-    If no URLs are found, does nothing.
-    If URLs are found, creates a timestamped backup before rewriting.
+    Returns `data` itself (the same object) if there is nothing to fix,
+    otherwise the cleaned contents as UTF-8 bytes (see save_fixed_playlist).
     """
-    try:
-        with open(txt_path, "r", encoding="utf-8") as f:
-            lines = f.read().splitlines()
-    except FileNotFoundError:
-        print(f"❌ TXT file not found when trying to clean URLs: {txt_path}")
-        return
+    # Cheap byte-level scan first; most files have no URLs at all
+    if not _has_url_hint(data):
+        return data
+
+    # Lines stay bytes; only the ones carrying a URL marker are decoded
+    lines = data.splitlines()
+    url_lines = [i for i, ln in enumerate(lines) if _is_url_line_bytes(ln)]
+    if not url_lines:
+        # Only matches inside comments
+        return data
+
+    print(f"\n🔍 URL-style labels detected in {source}.")
+    print("    This tool no longer uses URLs directly; they will be converted to proper labels.")
 
-    has_urls = any(
-        (("://" in ln and not ln.lstrip().startswith("#")) or ln.lstrip().startswith("[url="))
-        for ln in lines
-    )
-    if not has_urls:
-        # Quietly do nothing if there are no URLs
-        return
+    for i in url_lines:
+        new_label = _process_url_line_interactive(lines[i].decode("utf-8"))
+        lines[i] = new_label.encode("utf-8")
 
-    print(f"\n🔍 URL-style labels detected in {txt_path}.")
-    print("    This tool no longer uses URLs directly; they will be converted to proper labels.")
-    backup_path = _backup_file(txt_path)
-    print(f"📦 Backup of original file created at:\n  {backup_path}")
+    return b"\n".join(lines) + b"\n"
 
-    new_lines = []
-    for line in lines:
-        stripped = line.lstrip()
-        if not stripped or stripped.startswith("#"):
-            new_lines.append(line.rstrip("\n"))
-            continue
 
-        if stripped.startswith("[url=") or "://" in stripped:
-            new_lines.append(_process_url_line_interactive(line))
-        else:
-            new_lines.append(line.rstrip("\n"))
+def save_fixed_playlist(txt_path: str, new_data: bytes) -> None:
+    """
+    Back up txt_path, then overwrite it with the output of fix_playlist_urls_bytes.
+    """
+    backup_path = _backup_file(txt_path)
+    print(f"📦 Backup of original file created at:\n  {backup_path}")
 
-    with open(txt_path, "w", encoding="utf-8") as f:
-        for ln in new_lines:
-            f.write(ln + "\n")
+    with open(txt_path, "wb") as f:
+        f.write(new_data)
 
     print(f"✅ URL cleanup complete for: {txt_path}")
     print("   All songs are now stored as [pid=HEX] Title – Artist or Title – Artist only.")
+
@@ -2,13 +2,20 @@
 """
 PID / label helper utilities shared by the playlist generator and AppleScript bridge.
 """
+from functools import lru_cache
 
 PID_PREFIX = "[pid="
 URL_PREFIX = "[url="
+# For scanning raw file bytes before decoding
+URL_PREFIX_B = URL_PREFIX.encode("ascii")
+
+_HEX_DIGITS = frozenset("0123456789ABCDEFabcdef")
 
 
 def label_has_pid(label: str) -> bool:
     """Return True if the label starts with a [pid=...] prefix (ignoring leading spaces)."""
+    # Already two C-level calls: lstrip() hands back the label itself when it
+    # has no leading space, so a startswith() fast path only adds a check
     return label.lstrip().startswith(PID_PREFIX)
 
 
@@ -35,9 +42,10 @@ def extract_pid(label_or_pid: str):
     if s.lower().startswith("pid="):
         return s[4:].strip()
 
-    # Heuristic: 16-char hex (the usual Music persistent ID)
+    # Heuristic: 16-char hex (the usual Music persistent ID).
+    # A set test rather than int(x, 16), which would also take "0x", "_" and signs.
     hex_candidate = s.replace(" ", "")
-    if len(hex_candidate) == 16 and all(c in "0123456789ABCDEFabcdef" for c in hex_candidate):
+    if len(hex_candidate) == 16 and _HEX_DIGITS.issuperset(hex_candidate):
         return hex_candidate.upper()
 
     return None
@@ -84,6 +92,26 @@ def display_label(label: str) -> str:
     return strip_pid(label)
 
 
+@lru_cache(maxsize=4096)
+def split_label(label: str):
+    """
+    (display_label(label), extract_pid(label)) with the [pid=...] prefix parsed
+    only once. Cached, since menus show the same labels over and over.
+    """
+    s = label.strip()
+    if s.startswith(PID_PREFIX):
+        closing = s.find("]")
+        if closing != -1:
+            pid = s[len(PID_PREFIX):closing].strip()
+            rest = s[closing + 1:].lstrip()
+            if rest.startswith(URL_PREFIX):
+                closing2 = rest.find("]")
+                if closing2 != -1:
+                    rest = rest[closing2 + 1:].lstrip()
+            return rest.strip(), pid
+    return strip_pid(label), extract_pid(label)
+
+
 def get_label_with_optional_pid(raw_label: str) -> str:
     """
     Unified helper:
@@ -1,21 +1,35 @@
 #!/usr/bin/env python3
 import heapq
-from collections import deque
+from collections.abc import Mapping
 import random
 import textwrap
 
+import scheduler_core
+
 
 # ---------- Basic count helpers ----------
 
 def _count_map(tracks):
     """
-    tracks: list of {"name": str, "count": int}
+    tracks: a mapping {name: count} (e.g. a Counter)
+            or a list of (name, count) tuples
+            (legacy {"name": str, "count": int} dicts are still accepted)
     Returns a dict {name: total_count} merging duplicates if needed.
     """
     counts = {}
+    if isinstance(tracks, Mapping):
+        for name, c in tracks.items():
+            c = int(c)
+            if c > 0:
+                counts[name] = c
+        return counts
+
     for t in tracks:
-        name = t["name"]
-        c = int(t["count"])
+        if isinstance(t, dict):
+            name, c = t["name"], t["count"]
+        else:
+            name, c = t
+        c = int(c)
         if c > 0:
             counts[name] = counts.get(name, 0) + c
     return counts
@@ -23,18 +37,40 @@ def _count_map(tracks):
 
 # ---------- Feasibility analysis & explanation ----------
 
-def analyze_gap_feasibility(tracks, gap):
+def _count_summary(counts):
+    """
+    The gap-independent part of the feasibility math for a {name: count}
+    dict from _count_map: total, max_count and most_songs.
+    """
+    if not counts:
+        return {"total": 0, "max_count": 0, "most_songs": []}
+
+    max_count = max(counts.values())
+    return {
+        "total": sum(counts.values()),
+        "max_count": max_count,
+        "most_songs": [n for n, c in counts.items() if c == max_count],
+    }
+
+
+def analyze_gap_feasibility(tracks, gap, summary=None):
     """
     Check if a given min_gap is mathematically possible
     for the given counts.
 
+    summary: optional _count_summary of the tracks, so callers trying
+             several gaps don't rebuild the counts each time.
+
     Returns a dict with:
       - feasible: bool
       - gap, total, max_count, most_songs, others, required_others,
         extra_others_needed, max_feasible_for_max_song
     """
-    counts = _count_map(tracks)
-    if not counts:
+    if summary is None:
+        summary = _count_summary(_count_map(tracks))
+
+    total = summary["total"]
+    if not total:
         return {
             "feasible": True,
             "gap": gap,
@@ -47,9 +83,8 @@ def analyze_gap_feasibility(tracks, gap):
             "max_feasible_for_max_song": 0,
         }
 
-    total = sum(counts.values())
-    max_count = max(counts.values())
-    most_songs = [n for n, c in counts.items() if c == max_count]
+    max_count = summary["max_count"]
+    most_songs = summary["most_songs"]
 
     if gap <= 0:
         return {
@@ -83,12 +118,12 @@ def analyze_gap_feasibility(tracks, gap):
     }
 
 
-def explain_gap_issue(tracks, gap):
+def explain_gap_issue(tracks, gap, summary=None):
     """
     Produce a human-readable explanation string if a given gap is impossible.
     Returns None if it's actually feasible.
     """
-    info = analyze_gap_feasibility(tracks, gap)
+    info = analyze_gap_feasibility(tracks, gap, summary)
     if info["feasible"]:
         return None
 
@@ -117,68 +152,154 @@ def explain_gap_issue(tracks, gap):
 
 # ---------- Deterministic scheduler (always correct if feasible) ----------
 
+def _gap_ok(order, min_gap):
+    """True if every repeat in `order` has at least min_gap other songs in between."""
+    last_pos = {}
+    get = last_pos.get
+    # Unseen songs default far enough back to always pass
+    floor = -min_gap - 1
+    for i, s in enumerate(order):
+        if i - get(s, floor) <= min_gap:
+            return False
+        last_pos[s] = i
+    return True
+
+
+def _schedule_specialized(counts, min_gap, names=None):
+    """
+    Fast paths for two common shapes that don't need the heap:
+
+      - Every song has the same count: the schedule is just the (sorted)
+        names repeated, which is exactly what the heap would produce.
+      - One song dominates (more than 10x the rarest count): it is placed at
+        even strides and the other songs, taken round by round, fill the
+        slots in between.
+
+    counts: dict {name: count} from _count_map.
+    names: sorted(counts), if the caller already has it.
+    Returns None if neither shape applies or the result would break min_gap,
+    so the caller can fall back to _schedule_with_gap.
+    """
+    if not counts or min_gap <= 0:
+        return None
+
+    if names is None:
+        names = sorted(counts)
+    cmax = max(counts.values())
+    cmin = min(counts.values())
+
+    if cmax == cmin:
+        if cmax > 1 and len(names) - 1 < min_gap:
+            return None
+        return names * cmax
+
+    top = [n for n in names if counts[n] == cmax]
+    if len(top) != 1 or cmax <= 10 * cmin:
+        return None
+
+    dominant = top[0]
+    rest = [n for n in names if n != dominant]
+    fill = [
+        n
+        for r in range(max(counts[n] for n in rest))
+        for n in rest
+        if counts[n] > r
+    ]
+
+    # Spread the other songs over the cmax - 1 slots between dominant plays
+    slots = cmax - 1
+    q, extra = divmod(len(fill), slots)
+    result = []
+    pos = 0
+    for k in range(slots):
+        size = q + (1 if k < extra else 0)
+        result.append(dominant)
+        result.extend(fill[pos:pos + size])
+        pos += size
+    result.append(dominant)
+
+    if not _gap_ok(result, min_gap):
+        return None
+    return result
+
+
 def _schedule_with_gap(tracks, min_gap=3):
     """
     Deterministic scheduler using a max-heap + cooldown queue.
 
-    tracks: list of {"name": str, "count": int}
+    tracks: mapping {name: count} or list of (name, count) tuples
     min_gap: minimum number of *other* songs between repeats.
     Returns: list of names in a valid order, or raises ValueError
              if it cannot satisfy the gap.
     """
     counts = _count_map(tracks)
+    return _schedule_with_gap_counts(counts, sum(counts.values()), min_gap)
+
+
+def _schedule_with_gap_counts(counts, total, min_gap):
+    """
+    _schedule_with_gap on an already built {name: count} dict and its total,
+    so generate_round_robin can retry smaller gaps without redoing _count_map.
+    """
     if not counts:
         return []
 
-    total = sum(counts.values())
-
     if min_gap <= 0:
         result = []
         for name, c in counts.items():
             result.extend([name] * c)
         return result
 
+    # Long schedules go through the Numba-compiled core when it's installed
+    fast = scheduler_core.schedule_with_gap(counts, min_gap)
+    if fast is not None:
+        return fast
+
     # Heap of (-count, name)
     heap = [(-c, name) for name, c in counts.items()]
     heapq.heapify(heap)
 
-    # Cooldown queue: (ready_step, -count_remaining, name)
-    cooldown = deque()
+    # Cooldown ring of min_gap + 1 slots holding (-count_remaining, name).
+    # Exactly one song is placed per step, so a song placed from slot
+    # step % ring is due back when the step count wraps around to that
+    # same slot, and each slot holds at most one entry.
+    ring = min_gap + 1
+    cooldown = [None] * ring
+    pending = 0
     result = []
     step = 0
 
-    while heap or cooldown:
-        # Return items whose cooldown has expired
-        while cooldown and cooldown[0][0] <= step:
-            _, negc, nm = cooldown.popleft()
-            heapq.heappush(heap, (negc, nm))
+    # Bind the hot-loop callables once instead of looking them up per step
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    result_append = result.append
+
+    while heap or pending:
+        # Return the song whose cooldown expires at this step, if any
+        slot = step % ring
+        entry = cooldown[slot]
+        if entry is not None:
+            cooldown[slot] = None
+            pending -= 1
+            heappush(heap, entry)
 
         if not heap:
             # Nothing we can place, but some songs still pending
-            if len(result) != total:
-                raise ValueError("Cannot schedule with given gap; heap empty while songs remain.")
-            break
-
-        negc, name = heapq.heappop(heap)
-        count_left = -negc
+            raise ValueError("Cannot schedule with given gap; heap empty while songs remain.")
 
-        result.append(name)
+        negc, name = heappop(heap)
+        result_append(name)
         step += 1
-        count_left -= 1
 
-        if count_left > 0:
-            cooldown.append((step + min_gap, -count_left, name))
+        if negc < -1:
+            cooldown[slot] = (negc + 1, name)
+            pending += 1
 
     if len(result) != total:
         raise ValueError("Cannot schedule with given gap; not all songs placed.")
 
-    # Safety check
-    if min_gap > 0:
-        last_pos = {}
-        for i, s in enumerate(result):
-            if s in last_pos and i - last_pos[s] - 1 < min_gap:
-                raise AssertionError("min_gap violated by internal scheduler")
-            last_pos[s] = i
+    # Safety check (stripped under python -O; the heap already guarantees it)
+    assert _gap_ok(result, min_gap), "min_gap violated by internal scheduler"
 
     return result
 
@@ -194,27 +315,27 @@ def _randomize_schedule_preserving_gap(order, min_gap, seed=None, passes=2):
         return order[:]
 
     rng = random.Random(seed)
+    randrange = rng.randrange
     n = len(order)
     res = order[:]
 
-    def valid_all():
-        last = {}
-        for i, s in enumerate(res):
-            if s in last and i - last[s] - 1 < min_gap:
+    def local_ok(i, name):
+        # Only the min_gap neighbours on each side can clash with res[i]
+        for k in range(max(0, i - min_gap), min(n, i + min_gap + 1)):
+            if k != i and res[k] == name:
                 return False
-            last[s] = i
         return True
 
-    assert valid_all()
+    assert _gap_ok(res, min_gap)
 
     num_swaps = passes * n
     for _ in range(num_swaps):
-        i = rng.randrange(n)
-        j = rng.randrange(n)
+        i = randrange(n)
+        j = randrange(n)
         if i == j:
             continue
         res[i], res[j] = res[j], res[i]
-        if not valid_all():
+        if not (local_ok(i, res[i]) and local_ok(j, res[j])):
             # revert if swap breaks gap constraint
             res[i], res[j] = res[j], res[i]
 
@@ -231,14 +352,18 @@ def generate_round_robin(
     seed=None,
 ):
     """
-    Unified scheduler:
+    Unified scheduler.
+
+    tracks: a mapping {name: count} (e.g. the editor's Counter)
+            or a list of (name, count) tuples
 
       - Tries min_gap = preferred_gap (e.g., 3).
       - If impossible, falls back down to min_allowed_gap (e.g., 2).
       - NEVER uses gap < min_allowed_gap (so you can forbid gap=1).
 
     If `randomize` is False:
-      - Returns deterministic schedule from _schedule_with_gap.
+      - Returns deterministic schedule from _schedule_specialized (all counts
+        equal / one dominant song) or else _schedule_with_gap.
 
     If `randomize` is True:
       - Uses the deterministic scheduler to get a valid baseline.
@@ -250,11 +375,15 @@ def generate_round_robin(
     if preferred_gap < min_allowed_gap:
         preferred_gap, min_allowed_gap = min_allowed_gap, preferred_gap
 
+    counts = _count_map(tracks)
+    # Counts don't change between gap attempts; summarize and sort them once
+    summary = _count_summary(counts)
+    names = sorted(counts)
     last_issue = None
     gap = preferred_gap
 
     while gap >= min_allowed_gap:
-        info = analyze_gap_feasibility(tracks, gap)
+        info = analyze_gap_feasibility(tracks, gap, summary)
         if not info["feasible"]:
             # We know this gap is mathematically impossible, move on
             last_issue = info
@@ -263,7 +392,9 @@ def generate_round_robin(
 
         try:
             print(f"[*] Trying to schedule with min_gap={gap}{' (with randomization)' if randomize else ''}...")
-            base = _schedule_with_gap(tracks, min_gap=gap)
+            base = _schedule_specialized(counts, gap, names)
+            if base is None:
+                base = _schedule_with_gap_counts(counts, summary["total"], gap)
             print(f"[*] Success with min_gap={gap}.")
             if randomize:
                 return _randomize_schedule_preserving_gap(base, gap, seed=seed)
@@ -271,11 +402,11 @@ def generate_round_robin(
         except ValueError as e:
             # extremely rare, but if deterministic scheduler fails, try a smaller gap
             print(f"[!] Internal scheduler failed at gap {gap}: {e}")
-            last_issue = analyze_gap_feasibility(tracks, gap)
+            last_issue = analyze_gap_feasibility(tracks, gap, summary)
             gap -= 1
 
     if last_issue is None:
         raise ValueError("No tracks to schedule.")
 
-    msg = explain_gap_issue(tracks, last_issue["gap"])
+    msg = explain_gap_issue(tracks, last_issue["gap"], summary)
     raise ValueError(msg or "Cannot schedule playlist with given gaps.")
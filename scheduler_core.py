@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Optional Numba-compiled core of the gap scheduler.
+
+The same max-heap + cooldown queue as scheduler._schedule_with_gap, but run
+over integer song ids in typed arrays so Numba can compile it to machine
+code. Songs are numbered in name order and heap entries are packed as
+-count * n + id, so ties break exactly like the (-count, name) tuples of the
+pure-Python version and both produce the same schedule.
+
+scheduler uses it for long schedules whenever Numba is installed and keeps
+the pure-Python loop as the fallback.
+
+Requires: pip install numba
+"""
+
+# Below this many slots the one-off JIT compile costs more than it saves
+JIT_MIN_TOTAL = 5000
+
+# numba / numpy, imported on the first schedule long enough to need them so
+# ordinary launches never pay for the import; False once known missing
+np = None
+_compiled_core = None
+
+
+def _schedule_core(counts, min_gap):
+    """
+    counts: int64 array of play counts, indexed by song id.
+    Returns an int64 array of song ids; it is shorter than sum(counts) if
+    the heap ran dry before every song was placed.
+    """
+    n = counts.shape[0]
+    total = 0
+    for i in range(n):
+        total += counts[i]
+
+    # Binary min-heap of packed keys (-count * n + id)
+    heap = np.empty(n, np.int64)
+    size = 0
+    for i in range(n):
+        key = -counts[i] * n + i
+        k = size
+        size += 1
+        while k > 0:
+            parent = (k - 1) >> 1
+            if heap[parent] <= key:
+                break
+            heap[k] = heap[parent]
+            k = parent
+        heap[k] = key
+
+    # Ring-buffer cooldown queue; each song is in it at most once
+    cd_ready = np.empty(n, np.int64)
+    cd_key = np.empty(n, np.int64)
+    cd_head = 0
+    cd_len = 0
+
+    result = np.empty(total, np.int64)
+    step = 0
+
+    while size > 0 or cd_len > 0:
+        # Return items whose cooldown has expired
+        while cd_len > 0 and cd_ready[cd_head] <= step:
+            key = cd_key[cd_head]
+            cd_head += 1
+            if cd_head == n:
+                cd_head = 0
+            cd_len -= 1
+            k = size
+            size += 1
+            while k > 0:
+                parent = (k - 1) >> 1
+                if heap[parent] <= key:
+                    break
+                heap[k] = heap[parent]
+                k = parent
+            heap[k] = key
+
+        if size == 0:
+            # Nothing we can place, but some songs still pending
+            break
+
+        top = heap[0]
+        size -= 1
+        if size > 0:
+            last = heap[size]
+            k = 0
+            while True:
+                child = 2 * k + 1
+                if child >= size:
+                    break
+                if child + 1 < size and heap[child + 1] < heap[child]:
+                    child += 1
+                if last <= heap[child]:
+                    break
+                heap[k] = heap[child]
+                k = child
+            heap[k] = last
+
+        song = top % n
+        count_left = -(top - song) // n - 1
+        result[step] = song
+        step += 1
+
+        if count_left > 0:
+            tail = cd_head + cd_len
+            if tail >= n:
+                tail -= n
+            cd_ready[tail] = step + min_gap
+            cd_key[tail] = -count_left * n + song
+            cd_len += 1
+
+    return result[:step]
+
+
+def _load_core():
+    """The njit-compiled _schedule_core, or False if Numba isn't installed."""
+    global np, _compiled_core
+    if _compiled_core is None:
+        try:
+            import numba
+            import numpy
+        except ImportError:  # Numba (and with it NumPy) not installed
+            _compiled_core = False
+        else:
+            np = numpy
+            _compiled_core = numba.njit(cache=True)(_schedule_core)
+    return _compiled_core
+
+
+def schedule_with_gap(counts, min_gap):
+    """
+    counts: dict {name: count} with positive counts (from _count_map).
+    Returns the list of names in schedule order, or None if the compiled
+    core isn't available or the schedule is too short to be worth it.
+    Raises ValueError if the gap cannot be satisfied.
+    """
+    if min_gap <= 0 or sum(counts.values()) < JIT_MIN_TOTAL:
+        return None
+
+    core = _load_core()
+    if not core:
+        return None
+
+    names = sorted(counts)
+    counts_arr = np.array([counts[name] for name in names], np.int64)
+    ids = core(counts_arr, min_gap)
+    if len(ids) != int(counts_arr.sum()):
+        raise ValueError("Cannot schedule with given gap; not all songs placed.")
+    return [names[i] for i in ids.tolist()]
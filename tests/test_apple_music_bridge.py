@@ -0,0 +1,48 @@
+import os
+import shutil
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import apple_music_bridge  # noqa: E402
+
+# Stand-in for APPLE_MUSIC_SCRIPT: echoes the argv it was dispatched with,
+# so the test never talks to Music.app
+ECHO_SCRIPT = """
+on dispatch(argv)
+    set AppleScript's text item delimiters to "|"
+    set joined to argv as text
+    set AppleScript's text item delimiters to ""
+    return (count of argv) & ":" & joined as text
+end dispatch
+
+on drainlog()
+    return "drained"
+end drainlog
+"""
+
+
+@unittest.skipUnless(
+    sys.platform == "darwin" and shutil.which("osascript"), "needs macOS osascript"
+)
+class OsaBridgeTest(unittest.TestCase):
+    def setUp(self):
+        self.bridge = apple_music_bridge._OsaBridge(script=ECHO_SCRIPT)
+        self.addCleanup(self.bridge.close)
+
+    def test_request_args_arrive_as_separate_argv_items(self):
+        result = self.bridge.call(["applyParsed", "Mix, with comma", "1", "pid"])
+        self.assertIsNotNone(result, "persistent bridge failed to start")
+        rc, out, log = result
+        self.assertEqual(rc, 0)
+        self.assertEqual(out, "4:applyParsed|Mix, with comma|1|pid")
+        self.assertEqual(log, "drained")
+
+    def test_bridge_serves_several_requests(self):
+        self.assertEqual(self.bridge.call(["clear", "A"])[1], "2:clear|A")
+        self.assertEqual(self.bridge.call(["resetIndex"])[1], "1:resetIndex")
+
+
+if __name__ == "__main__":
+    unittest.main()